@@ -7,7 +7,8 @@
 #     4. Euclidian algorithm
 #     5. Prime 
 
-from Euclidean_GF_algorithm import extended_euclidean
+from aes_sbox import create_sbox, create_inverse_sbox, AFFINE_MATRIX, AFFINE_CONSTANT
+from gf256 import multiplication_table
 
 # AES - symmetric block cipher 
 # Block size: 128 bits (16 bytes) - the size of the plain text
@@ -75,74 +76,69 @@ sbox_transformation = {
 }
 
 
-# {1A} is row 1 column A -> Sbox transformation [1][A] = 7B
+# {1A} is row 1 column A -> Sbox transformation [1][A] = A2
+# NOTE: The inverse in GF(2^8) is a polynomial inverse modulo m(x), not the integer
+# extended Euclidean algorithm. It is taken from log/antilog tables of the generator 3:
+#   a^-1 = 3^(255 - log3(a))
+# The tables and the S-boxes are built once per polynomial (see gf256.py and aes_sbox.py)
 def create_Sbox(hexIrreduciblePoly):
-    sbox = [] # 16x16 matrix indexed from 0 to F 
-    # 1. Initialize S-box with byte values in ascending order by row 
-    for i in range(16):
-        row = []
-        for j in range(16):
-            byte = (i << 4) | j
-            row.append(byte)
-        sbox.append(row)
-
+    # 1. Initialize S-box with byte values in ascending order by row
     # 2. Map each nonzero byte in the sbox to its multiplicative inverse in GF(2^8)
-    for i in range(16):
-        for j in range(16):
-            byte = sbox[i][j]
-            if byte != 0:
-                inverse = extended_euclidean(byte, hexIrreduciblePoly)
-                sbox[i][j] = inverse
-
     # 3. Apply GF(2) affine transformation to each byte in the sbox
-    for i in range(16):
-        for j in range(16):
-            byte = sbox[i][j]
-            # Affine transformation: b' = b ⊕ (b_{i+4} mod 8) ⊕ (b_{i+5} mod 8) ⊕ (b_{i+6} mod 8) ⊕ (b_{i+7} mod 8) ⊕ c
-            # b' is the transformed byte, b is the original byte, and c is a constant (0x63)
-            # The mod is 8 because we are dealing with bytes (8 bits) defined by prev step 2^8
-            # i is 0 <= i <= 7
-            c = 0x63
-            transformed_byte = byte ^ ((byte >> 4) & 0x0F) ^ ((byte >> 5) & 0x0F) ^ ((byte >> 6) & 0x0F) ^ ((byte >> 7) & 0x0F) ^ c
-
-            sbox[i][j] = transformed_byte & 0xFF  # Ensure byte is within 0-255
+    sbox = create_sbox(hexIrreduciblePoly)
+    # 16x16 matrix indexed from 0 to F
+    return [list(sbox[16 * i:16 * i + 16]) for i in range(16)]
 
 
-b_matrix_representation[8][8] = {
-    [1, 0, 0, 0, 1, 1, 1, 1],   # b0
+# Affine transformation: b'_i = b_i ⊕ b_{(i+4) mod 8} ⊕ b_{(i+5) mod 8} ⊕ b_{(i+6) mod 8} ⊕ b_{(i+7) mod 8} ⊕ c_i
+# b' is the transformed byte, b is the original byte, and c is a constant (0x63)
+# The mod is 8 because we are dealing with bytes (8 bits) defined by prev step 2^8
+b_matrix_representation = [
+    [1, 0, 0, 0, 1, 1, 1, 1],  # b0
     [1, 1, 0, 0, 0, 1, 1, 1],  # b1
     [1, 1, 1, 0, 0, 0, 1, 1],  # b2
     [1, 1, 1, 1, 0, 0, 0, 1],  # b3
     [1, 1, 1, 1, 1, 0, 0, 0],  # b4
     [0, 1, 1, 1, 1, 1, 0, 0],  # b5
     [0, 0, 1, 1, 1, 1, 1, 0],  # b6
-    [0, 0, 0, 1, 1, 1, 1, 1]  # b7
-}
+    [0, 0, 0, 1, 1, 1, 1, 1]   # b7
+]
 
 # c is always 0x63 = 01100011, to get the non linearity
-c[8] =
-{
+c = [
     1, # c0
     1, # c1
     0, # c2
     0, # c3
     0, # c4
-    1, # c5 
+    1, # c5
     1, # c6
-    0 # c7
-}
+    0  # c7
+]
+
+# Each row of the matrix is kept as a bitmask in aes_sbox.AFFINE_MATRIX
+# so output bit i is the parity of (row_i AND b)
+assert all(
+    AFFINE_MATRIX[i] == sum(bit << j for j, bit in enumerate(row))
+    for i, row in enumerate(b_matrix_representation)
+)
+assert AFFINE_CONSTANT == sum(bit << i for i, bit in enumerate(c))
 
 def create_Inverse_Sbox(hexIrreduciblePoly):
+    # Inverse affine transformation followed by the multiplicative inverse
+    inv_sbox = create_inverse_sbox(hexIrreduciblePoly)
+    return [list(inv_sbox[16 * i:16 * i + 16]) for i in range(16)]
 
 
 def test_Sbox():
     hexIrreduciblePoly = 0x11B  # x^8 + x^4 + x^3 + x + 1
     sbox = create_Sbox(hexIrreduciblePoly)
-    # Theoretically compare with known S-box
-    # Find  value in the generated S-box for the 0x11b
-    theoric_value = sbox[1][0xA]  # Row 1, Column A
-    print(f"S-box value at [1][A]: {value:02X}") 
-    if theoric_value == sbox:
+    inv_sbox = create_Inverse_Sbox(hexIrreduciblePoly)
+    # Theoretically compare with known S-box (FIPS-197 Figure 7)
+    theoric_value = 0xA2
+    value = sbox[1][0xA]  # Row 1, Column A
+    print(f"S-box value at [1][A]: {value:02X}")
+    if theoric_value == value and inv_sbox[0xA][0x2] == 0x1A:
         print("S-box generation is correct.")
     else:
         print("S-box generation is incorrect.")
@@ -212,7 +208,7 @@ def matrix_multiplication(matA, matB):
 
     return result
 
-def gf_mult(a, b):
+def gf_mult_shift_add(a, b):
     # Galois Field (2^8) multiplication
     p = 0
     for _ in range(8):
@@ -225,12 +221,22 @@ def gf_mult(a, b):
         b >>= 1
     return p % 256
 
+# Precomputed 256x256 product table (64 KiB), one lookup instead of 8 shift/add steps
+# For whole arrays of bytes use gf256_numpy.mul / gf256_numpy.dot
+GF_MULT_TABLE = multiplication_table(0x11B)
+
+def gf_mult(a, b):
+    # Galois Field (2^8) multiplication by table lookup
+    return GF_MULT_TABLE[(a << 8) | b]
+
 
 # 4 AddRoundKey Step (ARK Transformation)
 # Each byte of the state is combined with a byte of the round key using bitwise XOR
 # This step is crucial for the security of the cipher as it introduces key dependency into the state
 # The round keys are derived from the original key using a key schedule algorithm
 
+# For bulk work aes_engine.py keeps the state as four 32-bit column words and the
+# round keys in the same format, so this step becomes 4 XORs without any new lists
 def add_round_key(state, round_key):
     for i in range(4):
         for j in range(4):
@@ -9,11 +9,19 @@
 # 5. CTR (Counter)
 
 # Import necessary cryptographic functions and utilities
+# The modes themselves are implemented in block_modes.py for any cipher object with
+# block_size, encrypt_block and decrypt_block (AES from aes_engine.py, DES/3DES/KE-DES from des_adapters.py)
+from block_modes import MODES, SEGMENT_MODES, encryptor, decryptor, encrypt, decrypt
+from aes_engine import AES
+from des_adapters import DESCipher
+from formatting_utils import print_section_header
 
 
 # ECB (Electronic Codebook) Mode
 # In ECB mode, each block of plaintext is encrypted independently using the same key.
 # This mode is simple but can be insecure for certain types of data due to pattern leakage.
+# Equal plaintext blocks give equal ciphertext blocks, so repeated blocks in a ciphertext point to ECB
+# (ecb_scanner.py measures this on files of any size).
 
 
 
@@ -23,11 +31,21 @@
 # An initialization vector (IV) is used for the first block to ensure uniqueness.
 # This mode provides better security than ECB by introducing dependency between blocks.
 
+# Partial final blocks (ECB and CBC)
+# ECB and CBC only encrypt whole blocks, so the last block needs padding. PKCS#7 appends n bytes of value n
+# (a full extra block if the message is already aligned), so the ciphertext grows by 1 .. block_size bytes.
+# Ciphertext stealing (CBC-CS3) avoids the expansion: the last partial block is zero-filled and encrypted,
+# the ciphertext it "steals" from the previous block is dropped, and the last two blocks are swapped.
+# The message must be at least one block long. Both only touch the last one or two blocks.
+
 
 # CFB (Cipher Feedback) Mode
 # In CFB mode, the previous ciphertext block is encrypted and the output is XORed with the current plaintext block to produce the ciphertext.
 # This mode allows encryption of data in units smaller than the block size and can operate as a stream cipher.
 # It is useful for applications that require real-time encryption and decryption, such as video streaming or online gaming.
+# CFB-s feeds back s bits at a time: only the top s bits of E(register) are used, then the register shifts left by s
+# and takes in the s ciphertext bits. CFB-8 costs one block encryption per byte and CFB-1 one per bit
+# (modes 'CFB1', 'CFB8', 'CFB64' in block_modes.py; s = block size is the full-block CFB above).
 
 # OFB (Output Feedback) Mode
 # In OFB mode, the previous output block is encrypted and the output is XORed with the current plaintext block to produce the ciphertext.
@@ -39,4 +57,39 @@
 # This keystream block is then XORed with the plaintext block to produce the ciphertext.
 # CTR mode allows for parallel processing of blocks, making it efficient for high-speed applications.
 # It is widely used in modern cryptographic applications due to its efficiency and security.
+# Since block i only needs counter_0 + i, any byte range can be decrypted by seeking the counter
+# (see aes_ctr_parallel.py for a multi-process, seekable AES-CTR over memory-mapped files)
+
+# XTS (XEX-based Tweaked codebook with ciphertext Stealing)
+# Used for disk encryption: every sector is encrypted on its own with a tweak E_K2(sector number) that is
+# multiplied by alpha in GF(2^128) for each block, C_j = E_K1(P_j XOR T_j) XOR T_j.
+# Any sector can be read or rewritten without touching the others (see aes_xts.py).
+
+
+
+if __name__ == "__main__":
+    print_section_header("BLOCK CIPHER MODES TEST")
+    message = b"MEET ME AFTER THE TOGA PARTY " * 2
+
+    for cipher, key_name in ((DESCipher(bytes.fromhex('133457799BBCDFF1')), "DES"),
+                             (AES(bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')), "AES")):
+        iv = bytes(range(cipher.block_size))
+        print(f"\n{key_name} (block size {cipher.block_size} bytes)")
+        for mode in MODES + SEGMENT_MODES:
+            if mode == f'CFB{8 * cipher.block_size}':
+                continue
+            ciphertext = encrypt(cipher, mode, message, iv)
+            assert decrypt(cipher, mode, ciphertext, iv) == message
+            print(f"  {mode:6}: {ciphertext.hex().upper()}")
+
+    # Streaming: feed the message in small chunks, only the partial block is buffered
+    aes = AES(bytes(16))
+    enc = encryptor(aes, 'CBC', bytes(16))
+    ciphertext = b''.join(enc.update(message[i:i + 5]) for i in range(0, len(message), 5)) + enc.finalize()
+    dec = decryptor(aes, 'CBC', bytes(16))
+    print("\nStreaming CBC round trip:", dec.update(ciphertext) + dec.finalize() == message)
 
+    # Ciphertext stealing: the ciphertext is exactly as long as the message
+    ciphertext = encrypt(aes, 'CBC', message, bytes(16), padding='cs3')
+    assert decrypt(aes, 'CBC', ciphertext, bytes(16), padding='cs3') == message
+    print(f"CBC-CS3: {len(message)} bytes -> {len(ciphertext)} bytes: {ciphertext.hex().upper()}")
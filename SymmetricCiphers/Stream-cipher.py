@@ -9,74 +9,99 @@ from formatting_utils import (
 )
 
 # RC4 key scheduling algorithm (KSA)
-def KSA(s_len, input_key):
-    S = []
-    T = []
-    for i in range(s_len):
-        S.append(i)
-        T.append(input_key[i % len(input_key)])
+# These functions trace every step for small examples; rc4.py (RC4 class) is the same algorithm for real data
+def KSA(s_len, input_key, trace=True):
+    """
+    RC4 Key Scheduling Algorithm (KSA) for a state of s_len entries.
 
-    print_section_header("RC4 Key Scheduling Algorithm (KSA)")
-    print(f"Initial S: {S}")
+    Args:
+        s_len (int): Size of S (256 for real RC4, small values for examples)
+        input_key (list | bytes): Key values
+        trace (bool): Print every step (default: True)
+
+    Returns:
+        list: Permutation S of 0 .. s_len - 1
+    """
+    S = list(range(s_len))
+    T = [input_key[i % len(input_key)] for i in range(s_len)]
+
+    if trace:
+        print_section_header("RC4 Key Scheduling Algorithm (KSA)")
+        print(f"Initial S: {S}")
     # Initial permutation of S
     j = 0
     for i in range(s_len):
-        print_step_header(f"KSA Step {i+1}:", "Step description")
-        print(f"  Before: i={i}, j={j}, S={S}")
+        if trace:
+            print_step_header(f"KSA Step {i+1}:", "Step description")
+            print(f"  Before: i={i}, j={j}, S={S}")
         j = (j + S[i] + T[i]) % s_len
-        print(f"  Updated j = (j + S[i] + T[i]) mod {s_len} = ({j} + {S[i]} + {T[i]}) mod {s_len} = {j}")
-        print(f"  After: i={i}, j={j}, S={S}")
+        if trace:
+            print(f"  Updated j = (j + S[i] + T[i]) mod {s_len} = ({j} + {S[i]} + {T[i]}) mod {s_len} = {j}")
+            print(f"  After: i={i}, j={j}, S={S}")
         S[i], S[j] = S[j], S[i]  # Swap
-        print(f"  Swapped S: {S}\n")
+        if trace:
+            print(f"  Swapped S: {S}\n")
 
     return S
 
-def PRGA(S, M):
+def PRGA(S, M, trace=True):
     """
     Pseudo-Random Generation Algorithm (PRGA) for RC4.
+
+    Args:
+        S (list): State from KSA (modified in place)
+        M (str | bytes): Message to encrypt
+        trace (bool): Print every step (default: True)
+
+    Returns:
+        tuple: (key_stream list, encrypted message as str for str input, bytes otherwise)
     """
     i, j = 0, 0  # Initialize i and j
+    n = len(S)
     key_stream = []  # Store generated keystream bytes
     encrypted_message = []  # Store the XOR results (encrypted output)
+    is_text = isinstance(M, str)
 
-    print(f"Reset i = j = 0, Recall S = {S}\n")
+    if trace:
+        print(f"Reset i = j = 0, Recall S = {S}\n")
 
     for char in M:
-        # Step 1: Increment i
-        print(f"i = (i + 1) = {i+1} (mod {len(S)})")
-        i = (i + 1) % len(S)
+        value = ord(char) if is_text else char
 
+        # Step 1: Increment i
+        i = (i + 1) % n
         # Step 2: Update j
-        print(f"j = (j + S[i]) = ({j} + {S[i]}) = {j + S[i]} (mod {len(S)})")
-        j = (j + S[i]) % len(S)
-
+        if trace:
+            print(f"i = (i + 1) = {i} (mod {n})")
+            print(f"j = (j + S[i]) = ({j} + {S[i]}) = {j + S[i]} (mod {n})")
+        j = (j + S[i]) % n
 
         # Step 3: Swap S[i] and S[j]
         S[i], S[j] = S[j], S[i]
-        print(f"Swap (S[i] and S[j]): S = {S}")
 
         # Step 4: Generate t and k
-        t = (S[i] + S[j]) % len(S)
+        t = (S[i] + S[j]) % n
         k = S[t]
         key_stream.append(k)
-        print(f"t = (S[i] + S[j]) mod {len(S)} = ({S[i]} + {S[j]}) mod {len(S)} = {t}")
-        print(f"Output k = S[{t}] = {k}\n")
 
         # Step 5: XOR the keystream with the plaintext character
-        char_bin = format(ord(char), '08b')  # Convert character to binary
-        k_bin = format(k, '08b')             # Convert keystream byte to binary
-        result = ord(char) ^ k               # XOR operation
-        character = chr(result)              # Directly convert integer to ASCII
-        encrypted_message.append(character)
-
-        print(f"{char}    ({char_bin})")
-        print(f"XOR")
-        print(f"      {k_bin}")
-        print(f"=     {format(result, '08b')} (encrypted)\n")
-
-    print("Final Key Stream: ", key_stream)
-    print("Encrypted Message (in decimal): ", encrypted_message)
-
+        result = value ^ k
+        encrypted_message.append(result)
+
+        if trace:
+            print(f"Swap (S[i] and S[j]): S = {S}")
+            print(f"t = (S[i] + S[j]) mod {n} = ({S[i]} + {S[j]}) mod {n} = {t}")
+            print(f"Output k = S[{t}] = {k}\n")
+            print(f"{chr(value) if is_text else value}    ({format(value, '08b')})")
+            print(f"XOR")
+            print(f"      {format(k, '08b')}")
+            print(f"=     {format(result, '08b')} (encrypted)\n")
+
+    encrypted = ''.join(map(chr, encrypted_message)) if is_text else bytes(encrypted_message)
+    if trace:
+        print("Final Key Stream: ", key_stream)
+        print("Encrypted Message (in decimal): ", encrypted_message)
+    return key_stream, encrypted
 
 
 
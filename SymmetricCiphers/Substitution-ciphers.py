@@ -34,6 +34,10 @@ def caesar_cipher_decrypt(ciphertext, shift, alphabet='ABCDEFGHIJKLMNOPQRSTUVWXY
     return caesar_cipher_encrypt(ciphertext, -shift, alphabet)
 
 
+# The functions here print every step to show how the cipher works. substitution.py
+# has the same ciphers as cached str.translate tables, and rank_caesar() there
+# ranks all 26 shifts by chi-squared from one rotated letter histogram.
+
 def bfa_caesar_cipher(ciphertext, alphabet='ABCDEFGHIJKLMNOPQRSTUVWXYZ'):
     """Brute-force attack on Caesar cipher."""
     for shift in range(1, 26):
@@ -137,6 +141,7 @@ def frequency_analysis_compare(frequency):
 # PROBLEMS WITH VIGENÈRE CIPHER:
 # 1. Vulnerable to Kasiski examination and Friedman test (to determine key length)
 # 2. If the key is shorter than the plaintext, patterns may emerge.
+# vigenere_analysis.py implements both tests and solves the key column by column.
 
 vigenere_table = [[chr((i + j) % 26 + ord('A')) for j in range(26)] for i in range(26)]
 # Print Vigenère table
@@ -166,6 +171,9 @@ def vigenere_cipher_encrypt(plaintext, key):
             ciphertext += char
     return ciphertext
 
+# vigenere.py has the same cipher (and the autokey variant) as one NumPy
+# operation over the whole text, without the table lookups.
+
 def vigenere_cipher_decrypt(ciphertext, key):
     """Decrypts ciphertext using Vigenère cipher with a given key."""
     plaintext = ""
@@ -340,6 +348,8 @@ if __name__ == "__main__":
 
     # text = "iq ifcc vqqr fb rdq vfllcq na rdq cfjwhwz hr bnnb hcc hwwhbsqvqbre hwq vhlq"
     # https://5-letter-words.com/6-letter-word-finder used for guessoing
+    # substitution_solver.solve_monoalphabetic() searches the key with quadgram
+    # scores instead of guessing words (needs a few hundred letters)
 
     # Example usage vigenere cipher
     
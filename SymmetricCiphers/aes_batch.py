@@ -0,0 +1,213 @@
+"""
+Batch AES over NumPy State Arrays
+
+Encrypts N independent 16-byte blocks at once. The states are an (N, 16)
+uint8 array in the notebook's column-major byte order (block[r + 4*c]), so
+every round step of AES_algorithm.ipynb becomes one whole-batch operation:
+
+    sub_bytes      -> one fancy-index into the S-box
+    shift_rows     -> one fixed column gather
+    mix_columns    -> xtime/x3 table lookups and XORs of gathered columns
+    add_round_key  -> one broadcast XOR
+
+Python overhead is paid per round instead of per byte, which makes ECB and
+CTR style bulk workloads practical.
+"""
+
+import numpy as np
+
+from aes_core import BLOCK_SIZE
+from aes_engine import expand_key
+from aes_sbox import AES_SBOX, AES_INV_SBOX
+from gf256_numpy import get_field
+
+SBOX = np.frombuffer(AES_SBOX, dtype=np.uint8)
+INV_SBOX = np.frombuffer(AES_INV_SBOX, dtype=np.uint8)
+
+_MUL = get_field().mul_table
+# Rows of the multiplication table used by (Inv)MixColumns
+MUL2, MUL3 = _MUL[0x02], _MUL[0x03]
+MUL9, MUL11, MUL13, MUL14 = _MUL[0x09], _MUL[0x0B], _MUL[0x0D], _MUL[0x0E]
+
+# ShiftRows as a gather: out[r + 4c] = in[r + 4((c + r) mod 4)]
+SHIFT_ROWS_INDEX = np.array([r + 4 * ((c + r) % 4) for c in range(4) for r in range(4)])
+INV_SHIFT_ROWS_INDEX = np.array([r + 4 * ((c - r) % 4) for c in range(4) for r in range(4)])
+
+# Same column, row rotated up by k: ROW_ROTATE[k][r + 4c] = (r + k) mod 4 + 4c
+ROW_ROTATE = [np.array([(r + k) % 4 + 4 * c for c in range(4) for r in range(4)]) for k in range(4)]
+
+
+def sub_bytes(states, sbox=SBOX):
+    """Replace every byte of every state using the S-box."""
+    return sbox[states]
+
+
+def inv_sub_bytes(states, inv_sbox=INV_SBOX):
+    """Replace every byte of every state using the inverse S-box."""
+    return inv_sbox[states]
+
+
+def shift_rows(states):
+    """Shift row r of every state left by r bytes."""
+    return states[:, SHIFT_ROWS_INDEX]
+
+
+def inv_shift_rows(states):
+    """Shift row r of every state right by r bytes."""
+    return states[:, INV_SHIFT_ROWS_INDEX]
+
+
+def mix_columns(states):
+    """
+    Multiply every column of every state by the fixed matrix.
+
+    r_i = 02*s_i ^ 03*s_(i+1) ^ s_(i+2) ^ s_(i+3)   (row indices mod 4)
+    """
+    s1 = states[:, ROW_ROTATE[1]]
+    return MUL2[states] ^ MUL3[s1] ^ states[:, ROW_ROTATE[2]] ^ states[:, ROW_ROTATE[3]]
+
+
+def inv_mix_columns(states):
+    """
+    Multiply every column of every state by the inverse matrix.
+
+    r_i = 0E*s_i ^ 0B*s_(i+1) ^ 0D*s_(i+2) ^ 09*s_(i+3)   (row indices mod 4)
+    """
+    return (MUL14[states] ^ MUL11[states[:, ROW_ROTATE[1]]]
+            ^ MUL13[states[:, ROW_ROTATE[2]]] ^ MUL9[states[:, ROW_ROTATE[3]]])
+
+
+def add_round_key(states, round_key):
+    """XOR the round key into every state (in place)."""
+    states ^= round_key
+    return states
+
+
+def as_blocks(data):
+    """
+    View bytes-like data or an array as an (N, 16) uint8 array.
+
+    Args:
+        data (bytes | bytearray | memoryview | np.ndarray): Length must be a multiple of 16
+
+    Returns:
+        np.ndarray: (N, 16) uint8 array (a view when possible)
+
+    Raises:
+        ValueError: If the length is not a multiple of the block size
+    """
+    if isinstance(data, np.ndarray):
+        flat = data.astype(np.uint8, copy=False).reshape(-1)
+    else:
+        flat = np.frombuffer(data, dtype=np.uint8)
+    if flat.size % BLOCK_SIZE:
+        raise ValueError(f"Data length must be a multiple of {BLOCK_SIZE} bytes")
+    return flat.reshape(-1, BLOCK_SIZE)
+
+
+def counter_blocks(initial_counter, start, count):
+    """
+    Build count consecutive 128-bit big-endian counter blocks.
+
+    Args:
+        initial_counter (bytes): 16-byte counter block for block index 0
+        start (int): Index of the first block to generate
+        count (int): Number of blocks
+
+    Returns:
+        np.ndarray: (count, 16) uint8 array, row i = initial_counter + start + i (mod 2^128)
+    """
+    value = (int.from_bytes(initial_counter, 'big') + start) % (1 << 128)
+    high, low = value >> 64, value & 0xFFFFFFFFFFFFFFFF
+    # The low 64-bit halves wrap on overflow; a wrap carries into the high half
+    lows = np.arange(count, dtype=np.uint64) + np.uint64(low)
+    highs = np.uint64(high) + (lows < np.uint64(low)).astype(np.uint64)
+    blocks = np.empty((count, 2), dtype='>u8')
+    blocks[:, 0] = highs
+    blocks[:, 1] = lows
+    return blocks.view(np.uint8).reshape(count, BLOCK_SIZE)
+
+
+class BatchAES:
+    """
+    AES-128/192/256 applied to (N, 16) batches of independent blocks.
+
+    Args:
+        key (bytes): 16, 24 or 32 byte cipher key
+    """
+
+    block_size = BLOCK_SIZE
+
+    def __init__(self, key):
+        # Key schedule shared with aes_engine through its LRU cache
+        round_keys = b''.join(expand_key(bytes(key)).round_keys)
+        self.round_keys = np.frombuffer(round_keys, dtype=np.uint8).reshape(-1, BLOCK_SIZE)
+        self.rounds = len(self.round_keys) - 1
+
+    def encrypt_states(self, states):
+        """Encrypt an (N, 16) uint8 array of states, returning a new array."""
+        rk = self.round_keys
+        states = states ^ rk[0]
+        for rnd in range(1, self.rounds):
+            states = mix_columns(shift_rows(sub_bytes(states)))
+            add_round_key(states, rk[rnd])
+        states = shift_rows(sub_bytes(states))
+        return add_round_key(states, rk[self.rounds])
+
+    def decrypt_states(self, states):
+        """Decrypt an (N, 16) uint8 array of states, returning a new array."""
+        rk = self.round_keys
+        states = states ^ rk[self.rounds]
+        for rnd in range(self.rounds - 1, 0, -1):
+            states = inv_sub_bytes(inv_shift_rows(states))
+            states = inv_mix_columns(add_round_key(states, rk[rnd]))
+        states = inv_sub_bytes(inv_shift_rows(states))
+        return add_round_key(states, rk[0])
+
+    def encrypt_blocks(self, data):
+        """
+        ECB-encrypt data whose length is a multiple of 16.
+
+        Args:
+            data (bytes | np.ndarray): Plaintext blocks
+
+        Returns:
+            bytes | np.ndarray: Ciphertext, bytes for bytes-like input and an (N, 16) array otherwise
+        """
+        out = self.encrypt_states(as_blocks(data))
+        return out if isinstance(data, np.ndarray) else out.tobytes()
+
+    def decrypt_blocks(self, data):
+        """
+        ECB-decrypt data whose length is a multiple of 16.
+
+        Args:
+            data (bytes | np.ndarray): Ciphertext blocks
+
+        Returns:
+            bytes | np.ndarray: Plaintext, bytes for bytes-like input and an (N, 16) array otherwise
+        """
+        out = self.decrypt_states(as_blocks(data))
+        return out if isinstance(data, np.ndarray) else out.tobytes()
+
+    def encrypt_block(self, block):
+        """Encrypt a single 16-byte block."""
+        return self.encrypt_blocks(bytes(block))
+
+    def decrypt_block(self, block):
+        """Decrypt a single 16-byte block."""
+        return self.decrypt_blocks(bytes(block))
+
+    def ctr_keystream(self, initial_counter, start_block, n_blocks):
+        """
+        CTR keystream for blocks [start_block, start_block + n_blocks).
+
+        Args:
+            initial_counter (bytes): 16-byte counter block of block 0 (nonce || counter)
+            start_block (int): First block index
+            n_blocks (int): Number of keystream blocks
+
+        Returns:
+            np.ndarray: (n_blocks, 16) uint8 keystream
+        """
+        return self.encrypt_states(counter_blocks(initial_counter, start_block, n_blocks))
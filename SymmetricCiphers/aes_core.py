@@ -0,0 +1,98 @@
+"""
+AES Core Building Blocks
+
+Silent (no printing) versions of the AES key schedule from AES_algorithm.ipynb,
+shared by the faster AES engines in this folder. Bytes are laid out in the
+same column-major order as the notebook:
+
+    block[r + 4*c] == state[r][c]
+
+so a round key is simply 16 consecutive bytes of the expanded key.
+"""
+
+from aes_sbox import AES_SBOX
+
+# Number of rounds for each key length in bytes (Nk = 4, 6, 8 words)
+ROUNDS_BY_KEY_SIZE = {16: 10, 24: 12, 32: 14}
+
+BLOCK_SIZE = 16
+
+
+def rot_word(word):
+    """Rotate a word (4-byte list) left by one byte."""
+    return [word[1], word[2], word[3], word[0]]
+
+
+def sub_word(word, sbox=AES_SBOX):
+    """Apply S-box to each byte of the 4-byte word."""
+    return [sbox[b] for b in word]
+
+
+def compute_rcon(n):
+    """
+    Compute Rcon list up to index n (1-based). Rcon[1] = 0x01.
+
+    Args:
+        n (int): Highest index needed
+
+    Returns:
+        list: rcon[i] = x^(i-1) in GF(2^8) for i >= 1 (rcon[0] is unused)
+    """
+    rcon = [0] * (n + 1)
+    rcon[1] = 0x01
+    for i in range(2, n + 1):
+        r = rcon[i - 1] << 1
+        rcon[i] = r ^ 0x11B if r & 0x100 else r
+    return rcon
+
+
+# Largest Rcon index used by any key size (AES-128 needs 10)
+RCON = compute_rcon(10)
+
+
+def key_expansion(key_bytes):
+    """
+    Expand a cipher key into the AES key schedule.
+
+    Args:
+        key_bytes (bytes): 16, 24 or 32 byte cipher key
+
+    Returns:
+        list: 4 * (Nr + 1) words, each a list of 4 bytes
+
+    Raises:
+        ValueError: If the key is not 16, 24 or 32 bytes long
+    """
+    key = list(key_bytes)
+    if len(key) not in ROUNDS_BY_KEY_SIZE:
+        raise ValueError('Key must be 16, 24 or 32 bytes long')
+
+    Nk = len(key) // 4
+    Nr = ROUNDS_BY_KEY_SIZE[len(key)]
+    n_words = 4 * (Nr + 1)
+
+    w = [key[4 * i:4 * i + 4] for i in range(Nk)]
+    for i in range(Nk, n_words):
+        temp = w[i - 1]
+        if i % Nk == 0:
+            temp = sub_word(rot_word(temp))
+            temp[0] ^= RCON[i // Nk]
+        elif Nk > 6 and i % Nk == 4:
+            temp = sub_word(temp)
+        prev = w[i - Nk]
+        w.append([prev[j] ^ temp[j] for j in range(4)])
+    return w
+
+
+def expand_round_keys(key_bytes):
+    """
+    Expand a cipher key into Nr + 1 round keys in block byte order.
+
+    Args:
+        key_bytes (bytes): 16, 24 or 32 byte cipher key
+
+    Returns:
+        list: Nr + 1 round keys, each 16 bytes (round_key[r + 4*c] = k[r][c])
+    """
+    words = key_expansion(key_bytes)
+    return [bytes(b for word in words[4 * i:4 * i + 4] for b in word) for i in range(len(words) // 4)]
@@ -0,0 +1,179 @@
+"""
+Parallel, Seekable AES-CTR
+
+In CTR mode block i of the keystream is E_K(counter_0 + i), so any block can
+be computed without the ones before it (see Block-Cipher-modes.py). This
+module uses that to:
+
+    - split a file into segments whose keystream is computed by separate
+      worker processes and XORed into a memory-mapped output file
+    - decrypt (or encrypt) any byte range of a file by seeking the counter
+      to the block that contains the first byte
+
+Encryption and decryption are the same operation in CTR mode.
+"""
+
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from aes_batch import BatchAES
+from aes_core import BLOCK_SIZE
+
+# Bytes handed to one worker task (multiple of the block size)
+DEFAULT_SEGMENT_SIZE = 16 * 1024 * 1024
+
+# Bytes processed per keystream batch inside a worker, bounds its memory use
+CHUNK_SIZE = 1024 * 1024
+
+# Inputs smaller than this are processed in the calling process
+PARALLEL_THRESHOLD = 4 * 1024 * 1024
+
+
+@lru_cache(maxsize=32)
+def _cipher(key):
+    """Key schedule cached per process, reused by every segment of that key."""
+    return BatchAES(key)
+
+
+def keystream(key, initial_counter, offset, length):
+    """
+    Keystream bytes [offset, offset + length) of an AES-CTR stream.
+
+    Args:
+        key (bytes): 16, 24 or 32 byte AES key
+        initial_counter (bytes): 16-byte counter block of byte 0 (nonce || counter)
+        offset (int): Byte position in the stream
+        length (int): Number of keystream bytes
+
+    Returns:
+        np.ndarray: (length,) uint8 keystream
+    """
+    first_block, skip = divmod(offset, BLOCK_SIZE)
+    n_blocks = -(-(skip + length) // BLOCK_SIZE)
+    blocks = _cipher(bytes(key)).ctr_keystream(initial_counter, first_block, n_blocks)
+    return blocks.reshape(-1)[skip:skip + length]
+
+
+def ctr_xor(key, initial_counter, data, offset=0):
+    """
+    Encrypt or decrypt data that starts at byte offset of the CTR stream.
+
+    Args:
+        key (bytes): 16, 24 or 32 byte AES key
+        initial_counter (bytes): 16-byte counter block of byte 0
+        data (bytes-like): Input bytes
+        offset (int): Stream position of data[0] (default: 0)
+
+    Returns:
+        bytes: data XOR keystream
+    """
+    src = np.frombuffer(data, dtype=np.uint8)
+    out = np.empty_like(src)
+    for pos in range(0, src.size, CHUNK_SIZE):
+        chunk = src[pos:pos + CHUNK_SIZE]
+        np.bitwise_xor(chunk, keystream(key, initial_counter, offset + pos, chunk.size), out=out[pos:pos + CHUNK_SIZE])
+    return out.tobytes()
+
+
+def _crypt_segment(key, initial_counter, in_path, out_path, in_start, out_start, length):
+    """Worker: XOR the keystream of one segment into the mapped output file."""
+    with open(in_path, 'rb') as fin, open(out_path, 'r+b') as fout:
+        src_map = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+        dst_map = mmap.mmap(fout.fileno(), 0)
+        try:
+            src = np.frombuffer(src_map, dtype=np.uint8)
+            dst = np.frombuffer(dst_map, dtype=np.uint8)
+            for pos in range(0, length, CHUNK_SIZE):
+                n = min(CHUNK_SIZE, length - pos)
+                ks = keystream(key, initial_counter, in_start + pos, n)
+                np.bitwise_xor(src[in_start + pos:in_start + pos + n], ks,
+                               out=dst[out_start + pos:out_start + pos + n])
+            del src, dst
+            dst_map.flush()
+        finally:
+            dst_map.close()
+            src_map.close()
+    return length
+
+
+def crypt_file(key, initial_counter, in_path, out_path, start=0, length=None,
+               workers=None, segment_size=DEFAULT_SEGMENT_SIZE):
+    """
+    Encrypt or decrypt bytes [start, start + length) of a file into out_path.
+
+    The output file is preallocated and memory-mapped; each worker process
+    computes the keystream of its own segment by seeking the counter, so only
+    the requested range of the input is ever read.
+
+    Args:
+        key (bytes): 16, 24 or 32 byte AES key
+        initial_counter (bytes): 16-byte counter block of byte 0 of the file
+        in_path (str): Input file
+        out_path (str): Output file, receives exactly `length` bytes
+        start (int): First byte of the range (default: 0)
+        length (int, optional): Number of bytes (default: to the end of the file)
+        workers (int, optional): Worker processes (default: os.cpu_count())
+        segment_size (int): Bytes per worker task (default: 16 MiB)
+
+    Returns:
+        int: Number of bytes written
+
+    Raises:
+        ValueError: If the range is outside the input file, or out_path is in_path
+    """
+    # Opening the output truncates it, which would destroy the input first
+    if os.path.exists(out_path) and os.path.samefile(in_path, out_path):
+        raise ValueError("Output file must not be the input file")
+    file_size = os.path.getsize(in_path)
+    if length is None:
+        length = file_size - start
+    if start < 0 or length < 0 or start + length > file_size:
+        raise ValueError(f"Range [{start}, {start + length}) is outside the file ({file_size} bytes)")
+    if segment_size % BLOCK_SIZE:
+        raise ValueError(f"segment_size must be a multiple of {BLOCK_SIZE}")
+
+    with open(out_path, 'wb') as fout:
+        fout.truncate(length)
+    if length == 0:
+        return 0
+
+    # Segment boundaries fall on block boundaries of the stream, so no keystream
+    # block is computed twice
+    bounds = [start]
+    next_bound = (start // segment_size + 1) * segment_size
+    while next_bound < start + length:
+        bounds.append(next_bound)
+        next_bound += segment_size
+    bounds.append(start + length)
+    tasks = [(bytes(key), bytes(initial_counter), in_path, out_path, a, a - start, b - a)
+             for a, b in zip(bounds, bounds[1:])]
+
+    if length < PARALLEL_THRESHOLD or workers == 1 or len(tasks) == 1:
+        return sum(_crypt_segment(*task) for task in tasks)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(_crypt_segment, *zip(*tasks)))
+
+
+def crypt_range(key, initial_counter, in_path, start, length):
+    """
+    Decrypt (or encrypt) a byte range of a file without reading the rest.
+
+    Args:
+        key (bytes): 16, 24 or 32 byte AES key
+        initial_counter (bytes): 16-byte counter block of byte 0 of the file
+        in_path (str): Input file
+        start (int): First byte of the range
+        length (int): Number of bytes
+
+    Returns:
+        bytes: The transformed range
+    """
+    with open(in_path, 'rb') as fin:
+        fin.seek(start)
+        data = fin.read(length)
+    return ctr_xor(key, initial_counter, data, offset=start)
@@ -0,0 +1,276 @@
+"""
+Compact AES Engine (four 32-bit column words)
+
+The notebook version of AES keeps the state as a 4x4 list of lists and builds
+a new matrix in every step. Here the state is four Python ints, one 32-bit
+word per column (row 0 in the most significant byte), which is exactly the
+block read as big-endian words:
+
+    s_c = block[4c] << 24 | block[4c+1] << 16 | block[4c+2] << 8 | block[4c+3]
+
+Round keys are pre-laid-out in the same format, so AddRoundKey is four XORs.
+SubBytes, ShiftRows and MixColumns of one round are merged into four lookups
+per column in the "T-tables" Te0..Te3 (FIPS-197 section 5.2 / Rijndael
+proposal section 5.2.1):
+
+    Te0[x] = (02*S[x], S[x], S[x], 03*S[x])  and Te1..Te3 are byte rotations
+
+Decryption uses the equivalent inverse cipher (FIPS-197 section 5.3.5): with
+InvMixColumns applied to the middle round keys, InvSubBytes and InvMixColumns
+can also be merged into tables Td0..Td3. Both key schedules are computed once
+per key and kept in a bounded LRU cache (expand_key), so switching between
+many keys does not repeat the key expansion.
+
+encrypt_block_into / decrypt_block_into read from and write to caller-provided
+buffers, so processing many blocks allocates no state lists at all.
+"""
+
+import struct
+from functools import lru_cache
+
+from aes_core import BLOCK_SIZE, expand_round_keys
+from aes_sbox import AES_SBOX, AES_INV_SBOX
+from gf256 import multiplication_table
+
+_MUL = multiplication_table()
+
+_BLOCK_WORDS = struct.Struct('>4I')
+
+
+def _mul(a, b):
+    return _MUL[(a << 8) | b]
+
+
+def _ror8(word):
+    """Rotate a 32-bit word right by one byte."""
+    return ((word >> 8) | (word << 24)) & 0xFFFFFFFF
+
+
+def _rotations(table):
+    """Return (T0, T1, T2, T3) where Ti is T0 rotated right by i bytes."""
+    table = tuple(table)
+    t1 = tuple(_ror8(w) for w in table)
+    t2 = tuple(_ror8(w) for w in t1)
+    t3 = tuple(_ror8(w) for w in t2)
+    return table, t1, t2, t3
+
+
+# Forward T-tables: SubBytes + MixColumns column contribution of row 0
+TE0, TE1, TE2, TE3 = _rotations(
+    (_mul(2, s) << 24) | (s << 16) | (s << 8) | _mul(3, s) for s in AES_SBOX
+)
+
+# InvMixColumns contribution of row 0 (no S-box), used on the decryption round keys
+U0, U1, U2, U3 = _rotations(
+    (_mul(0x0E, x) << 24) | (_mul(0x09, x) << 16) | (_mul(0x0D, x) << 8) | _mul(0x0B, x) for x in range(256)
+)
+
+# Inverse T-tables: InvSubBytes + InvMixColumns column contribution of row 0
+TD0, TD1, TD2, TD3 = _rotations(U0[x] for x in AES_INV_SBOX)
+
+# Number of expanded keys kept by expand_key
+KEY_CACHE_SIZE = 1024
+
+
+def inv_mix_column_word(word):
+    """Apply InvMixColumns to one 32-bit column word."""
+    return U0[word >> 24] ^ U1[(word >> 16) & 255] ^ U2[(word >> 8) & 255] ^ U3[word & 255]
+
+
+def round_key_words(round_keys):
+    """
+    Flatten 16-byte round keys into a tuple of 32-bit column words.
+
+    Args:
+        round_keys (list): Nr + 1 round keys of 16 bytes
+
+    Returns:
+        tuple: 4 * (Nr + 1) ints, round r uses words [4r, 4r + 4)
+    """
+    return tuple(w for rk in round_keys for w in _BLOCK_WORDS.unpack(rk))
+
+
+class AESKey:
+    """
+    Expanded AES key: encryption and equivalent-inverse-cipher decryption schedules.
+
+    Attributes:
+        rounds (int): Nr (10, 12 or 14)
+        round_keys (tuple): Nr + 1 encryption round keys of 16 bytes
+        enc_keys (tuple): Encryption round keys as 4 * (Nr + 1) column words
+        dec_keys (tuple): Decryption round keys as 4 * (Nr + 1) column words, in
+                          the order they are used: round Nr first, InvMixColumns
+                          applied to rounds Nr-1 .. 1, round 0 last
+    """
+
+    __slots__ = ('rounds', 'round_keys', 'enc_keys', 'dec_keys')
+
+    def __init__(self, key):
+        self.round_keys = tuple(expand_round_keys(key))
+        self.rounds = len(self.round_keys) - 1
+        self.enc_keys = round_key_words(self.round_keys)
+        ek = self.enc_keys
+        nr = self.rounds
+        dec = list(ek[4 * nr:4 * nr + 4])
+        for r in range(nr - 1, 0, -1):
+            dec.extend(inv_mix_column_word(w) for w in ek[4 * r:4 * r + 4])
+        dec.extend(ek[0:4])
+        self.dec_keys = tuple(dec)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def expand_key(key):
+    """
+    Expand a key once and cache it (bounded LRU keyed by the key bytes).
+
+    Args:
+        key (bytes): 16, 24 or 32 byte cipher key
+
+    Returns:
+        AESKey: Shared, read-only expanded key
+    """
+    return AESKey(key)
+
+
+class AES:
+    """
+    AES-128/192/256 single-block engine with word-oriented state.
+
+    Args:
+        key (bytes): 16, 24 or 32 byte cipher key
+
+    Example:
+        >>> aes = AES(bytes.fromhex('000102030405060708090a0b0c0d0e0f'))
+        >>> aes.encrypt_block(bytes.fromhex('00112233445566778899aabbccddeeff')).hex()
+        '69c4e0d86a7b0430d8cdb78070b4c55a'
+    """
+
+    block_size = BLOCK_SIZE
+
+    def __init__(self, key):
+        expanded = expand_key(bytes(key))
+        self.rounds = expanded.rounds
+        self.enc_keys = expanded.enc_keys
+        self.dec_keys = expanded.dec_keys
+
+    def encrypt_block_into(self, src, dst, src_offset=0, dst_offset=0):
+        """
+        Encrypt the block at src[src_offset:] into dst[dst_offset:] in place.
+
+        Args:
+            src (bytes-like): Buffer holding the plaintext block
+            dst (bytearray | memoryview): Writable buffer for the ciphertext block
+            src_offset (int): Offset of the block in src (default: 0)
+            dst_offset (int): Offset of the block in dst (default: 0)
+        """
+        te0, te1, te2, te3, sbox = TE0, TE1, TE2, TE3, AES_SBOX
+        rk = self.enc_keys
+        s0, s1, s2, s3 = _BLOCK_WORDS.unpack_from(src, src_offset)
+        s0 ^= rk[0]
+        s1 ^= rk[1]
+        s2 ^= rk[2]
+        s3 ^= rk[3]
+        # Rounds 1 .. Nr-1: SubBytes + ShiftRows + MixColumns (tables) + AddRoundKey
+        # Row r of new column c comes from column (c + r) mod 4
+        for k in range(4, 4 * self.rounds, 4):
+            s0, s1, s2, s3 = (
+                te0[s0 >> 24] ^ te1[(s1 >> 16) & 255] ^ te2[(s2 >> 8) & 255] ^ te3[s3 & 255] ^ rk[k],
+                te0[s1 >> 24] ^ te1[(s2 >> 16) & 255] ^ te2[(s3 >> 8) & 255] ^ te3[s0 & 255] ^ rk[k + 1],
+                te0[s2 >> 24] ^ te1[(s3 >> 16) & 255] ^ te2[(s0 >> 8) & 255] ^ te3[s1 & 255] ^ rk[k + 2],
+                te0[s3 >> 24] ^ te1[(s0 >> 16) & 255] ^ te2[(s1 >> 8) & 255] ^ te3[s2 & 255] ^ rk[k + 3],
+            )
+        # Final round: SubBytes + ShiftRows + AddRoundKey (no MixColumns)
+        k = 4 * self.rounds
+        _BLOCK_WORDS.pack_into(
+            dst, dst_offset,
+            (((sbox[s0 >> 24] << 24)
+              | (sbox[(s1 >> 16) & 255] << 16)
+              | (sbox[(s2 >> 8) & 255] << 8)
+              | sbox[s3 & 255])
+             ^ rk[k]),
+            (((sbox[s1 >> 24] << 24)
+              | (sbox[(s2 >> 16) & 255] << 16)
+              | (sbox[(s3 >> 8) & 255] << 8)
+              | sbox[s0 & 255])
+             ^ rk[k + 1]),
+            (((sbox[s2 >> 24] << 24)
+              | (sbox[(s3 >> 16) & 255] << 16)
+              | (sbox[(s0 >> 8) & 255] << 8)
+              | sbox[s1 & 255])
+             ^ rk[k + 2]),
+            (((sbox[s3 >> 24] << 24)
+              | (sbox[(s0 >> 16) & 255] << 16)
+              | (sbox[(s1 >> 8) & 255] << 8)
+              | sbox[s2 & 255])
+             ^ rk[k + 3]),
+        )
+
+    def decrypt_block_into(self, src, dst, src_offset=0, dst_offset=0):
+        """
+        Decrypt the block at src[src_offset:] into dst[dst_offset:] in place.
+
+        Args:
+            src (bytes-like): Buffer holding the ciphertext block
+            dst (bytearray | memoryview): Writable buffer for the plaintext block
+            src_offset (int): Offset of the block in src (default: 0)
+            dst_offset (int): Offset of the block in dst (default: 0)
+        """
+        td0, td1, td2, td3, isb = TD0, TD1, TD2, TD3, AES_INV_SBOX
+        dk = self.dec_keys
+        s0, s1, s2, s3 = _BLOCK_WORDS.unpack_from(src, src_offset)
+        s0 ^= dk[0]
+        s1 ^= dk[1]
+        s2 ^= dk[2]
+        s3 ^= dk[3]
+        # Equivalent inverse cipher rounds: InvSubBytes + InvShiftRows + InvMixColumns
+        # (tables) + AddRoundKey with the InvMixColumns-transformed round key
+        # Row r of new column c comes from column (c - r) mod 4
+        for k in range(4, 4 * self.rounds, 4):
+            s0, s1, s2, s3 = (
+                td0[s0 >> 24] ^ td1[(s3 >> 16) & 255] ^ td2[(s2 >> 8) & 255] ^ td3[s1 & 255] ^ dk[k],
+                td0[s1 >> 24] ^ td1[(s0 >> 16) & 255] ^ td2[(s3 >> 8) & 255] ^ td3[s2 & 255] ^ dk[k + 1],
+                td0[s2 >> 24] ^ td1[(s1 >> 16) & 255] ^ td2[(s0 >> 8) & 255] ^ td3[s3 & 255] ^ dk[k + 2],
+                td0[s3 >> 24] ^ td1[(s2 >> 16) & 255] ^ td2[(s1 >> 8) & 255] ^ td3[s0 & 255] ^ dk[k + 3],
+            )
+        # Final round: InvShiftRows + InvSubBytes + AddRoundKey with the cipher key
+        k = 4 * self.rounds
+        _BLOCK_WORDS.pack_into(
+            dst, dst_offset,
+            (((isb[s0 >> 24] << 24)
+              | (isb[(s3 >> 16) & 255] << 16)
+              | (isb[(s2 >> 8) & 255] << 8)
+              | isb[s1 & 255])
+             ^ dk[k]),
+            (((isb[s1 >> 24] << 24)
+              | (isb[(s0 >> 16) & 255] << 16)
+              | (isb[(s3 >> 8) & 255] << 8)
+              | isb[s2 & 255])
+             ^ dk[k + 1]),
+            (((isb[s2 >> 24] << 24)
+              | (isb[(s1 >> 16) & 255] << 16)
+              | (isb[(s0 >> 8) & 255] << 8)
+              | isb[s3 & 255])
+             ^ dk[k + 2]),
+            (((isb[s3 >> 24] << 24)
+              | (isb[(s2 >> 16) & 255] << 16)
+              | (isb[(s1 >> 8) & 255] << 8)
+              | isb[s0 & 255])
+             ^ dk[k + 3]),
+        )
+
+    def encrypt_block(self, block):
+        """Encrypt a single 16-byte block and return the ciphertext as bytes."""
+        if len(block) != BLOCK_SIZE:
+            raise ValueError(f"AES block must be {BLOCK_SIZE} bytes")
+        # A fresh buffer per call: one cipher object may be shared between threads
+        out = bytearray(BLOCK_SIZE)
+        self.encrypt_block_into(block, out)
+        return bytes(out)
+
+    def decrypt_block(self, block):
+        """Decrypt a single 16-byte block and return the plaintext as bytes."""
+        if len(block) != BLOCK_SIZE:
+            raise ValueError(f"AES block must be {BLOCK_SIZE} bytes")
+        out = bytearray(BLOCK_SIZE)
+        self.decrypt_block_into(block, out)
+        return bytes(out)
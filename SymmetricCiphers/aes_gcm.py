@@ -0,0 +1,349 @@
+"""
+AES-GCM (Galois/Counter Mode) Authenticated Encryption
+
+GCM = CTR mode encryption + GHASH authentication (NIST SP 800-38D):
+
+    H   = E_K(0^128)                      hash key
+    J0  = IV || 0^31 || 1                 for a 96-bit IV, GHASH(IV) otherwise
+    C   = P XOR keystream(inc32(J0), ...)
+    S   = GHASH_H(A || pad || C || pad || len(A) || len(C))
+    T   = E_K(J0) XOR S                   authentication tag
+
+GHASH multiplies by H in GF(2^128) once per 16-byte block. Instead of the
+bit-serial multiply (128 shift/XOR steps) it uses 8-bit tables in the style
+of Shoup: for each of the 16 byte positions, the products of H with every
+possible byte value there. A multiplication is then 16 lookups and XORs.
+The tables depend only on H, so they are built once per key and cached
+together with the key schedule.
+"""
+
+import hmac
+from functools import lru_cache
+
+import numpy as np
+
+from aes_batch import BatchAES
+from aes_core import BLOCK_SIZE
+
+# Reduction constant of GF(2^128), x^128 + x^7 + x^2 + x + 1 in GCM bit order
+GCM_R = 0xE1 << 120
+
+# Keystream blocks generated per batch during update()
+CTR_BATCH_BLOCKS = 4096
+
+
+def gf128_mul(x, y):
+    """
+    Bit-serial multiplication in GF(2^128) with the GCM bit order (reference).
+
+    Args:
+        x (int): 128-bit field element (bytes read big-endian)
+        y (int): 128-bit field element
+
+    Returns:
+        int: x * y
+    """
+    z = 0
+    v = y
+    for i in range(127, -1, -1):
+        if (x >> i) & 1:
+            z ^= v
+        v = (v >> 1) ^ GCM_R if v & 1 else v >> 1
+    return z
+
+
+def ghash_tables(h):
+    """
+    Precompute the 8-bit GHASH tables for a hash key H.
+
+    tables[i][b] = (b placed in byte i of a block) * H, so that for a block
+    X = x_0 x_1 ... x_15:  X * H = tables[0][x_0] ^ ... ^ tables[15][x_15]
+
+    Args:
+        h (int): Hash key H as a 128-bit integer
+
+    Returns:
+        tuple: 16 tuples of 256 ints
+    """
+    # powers[j] = H * x^j; bit k of the integer is the coefficient of x^(127 - k)
+    powers = [h]
+    for _ in range(127):
+        v = powers[-1]
+        powers.append((v >> 1) ^ GCM_R if v & 1 else v >> 1)
+
+    tables = []
+    for i in range(16):
+        table = [0] * 256
+        for b in range(1, 256):
+            low = b & -b
+            bit = 8 * (15 - i) + low.bit_length() - 1
+            table[b] = table[b ^ low] ^ powers[127 - bit]
+        tables.append(tuple(table))
+    return tuple(tables)
+
+
+def ghash_blocks(tables, y, data):
+    """
+    Absorb whole 16-byte blocks into the GHASH state.
+
+    Args:
+        tables (tuple): Output of ghash_tables
+        y (int): Current GHASH state
+        data (bytes-like): Length must be a multiple of 16
+
+    Returns:
+        int: New GHASH state
+    """
+    t0, t1, t2, t3, t4, t5, t6, t7, t8, t9, t10, t11, t12, t13, t14, t15 = tables
+    from_bytes = int.from_bytes
+    mv = memoryview(data)
+    for pos in range(0, len(mv), BLOCK_SIZE):
+        b = (y ^ from_bytes(mv[pos:pos + BLOCK_SIZE], 'big')).to_bytes(BLOCK_SIZE, 'big')
+        y = (t0[b[0]] ^ t1[b[1]] ^ t2[b[2]] ^ t3[b[3]] ^ t4[b[4]] ^ t5[b[5]] ^ t6[b[6]] ^ t7[b[7]]
+             ^ t8[b[8]] ^ t9[b[9]] ^ t10[b[10]] ^ t11[b[11]] ^ t12[b[12]] ^ t13[b[13]] ^ t14[b[14]] ^ t15[b[15]])
+    return y
+
+
+@lru_cache(maxsize=64)
+def _key_context(key):
+    """Key schedule and GHASH tables, computed once per key."""
+    cipher = BatchAES(key)
+    h = int.from_bytes(cipher.encrypt_block(bytes(BLOCK_SIZE)), 'big')
+    return cipher, ghash_tables(h)
+
+
+def inc32_blocks(j0, start, count):
+    """
+    Counter blocks inc32^(start + i)(J0): the low 32 bits wrap, the rest is fixed.
+
+    Args:
+        j0 (bytes): 16-byte pre-counter block
+        start (int): Increment of the first block
+        count (int): Number of blocks
+
+    Returns:
+        np.ndarray: (count, 16) uint8 counter blocks
+    """
+    blocks = np.empty((count, BLOCK_SIZE), dtype=np.uint8)
+    blocks[:, :12] = np.frombuffer(j0[:12], dtype=np.uint8)
+    low = (np.arange(count, dtype=np.uint64) + (int.from_bytes(j0[12:], 'big') + start)) & 0xFFFFFFFF
+    blocks[:, 12:] = low.astype('>u4').view(np.uint8).reshape(count, 4)
+    return blocks
+
+
+class _GCMContext:
+    """Shared state of a GCM encryptor/decryptor (CTR position and GHASH)."""
+
+    def __init__(self, key, iv, aad):
+        if len(iv) == 0:
+            raise ValueError("IV must not be empty")
+        self._cipher, self._tables = _key_context(bytes(key))
+        if len(iv) == 12:
+            j0 = bytes(iv) + b'\x00\x00\x00\x01'
+        else:
+            padded = bytes(iv) + bytes(-len(iv) % BLOCK_SIZE) + (8 * len(iv)).to_bytes(16, 'big')
+            j0 = ghash_blocks(self._tables, 0, padded).to_bytes(16, 'big')
+        self._j0 = j0
+        self._y = 0
+        self._aad_len = 0
+        self._aad_buffer = b''
+        self._aad_done = False
+        self._text_len = 0
+        self._ghash_buffer = b''
+        self._keystream = b''
+        self._finalized = False
+        if aad:
+            self.authenticate_additional_data(aad)
+
+    def authenticate_additional_data(self, aad):
+        """
+        Feed additional authenticated data (only before the first update()).
+
+        Args:
+            aad (bytes-like): Data that is authenticated but not encrypted
+        """
+        if self._aad_done or self._finalized:
+            raise ValueError("AAD must be supplied before update() and finalize()")
+        data = self._aad_buffer + bytes(aad)
+        whole = len(data) - len(data) % BLOCK_SIZE
+        self._y = ghash_blocks(self._tables, self._y, data[:whole])
+        self._aad_buffer = data[whole:]
+        self._aad_len += len(aad)
+
+    def _close_aad(self):
+        if not self._aad_done:
+            if self._aad_buffer:
+                padded = self._aad_buffer + bytes(BLOCK_SIZE - len(self._aad_buffer))
+                self._y = ghash_blocks(self._tables, self._y, padded)
+                self._aad_buffer = b''
+            self._aad_done = True
+
+    def _xor_keystream(self, data):
+        """XOR data with the next len(data) bytes of the GCTR keystream."""
+        n = len(data)
+        ks = self._keystream
+        if len(ks) < n:
+            # Whole blocks continue from the stream position after the buffered bytes
+            next_block = (self._text_len + len(ks)) // BLOCK_SIZE
+            n_blocks = -(-(n - len(ks)) // BLOCK_SIZE)
+            parts = [ks]
+            for first in range(0, n_blocks, CTR_BATCH_BLOCKS):
+                count = min(CTR_BATCH_BLOCKS, n_blocks - first)
+                counters = inc32_blocks(self._j0, 1 + next_block + first, count)
+                parts.append(self._cipher.encrypt_states(counters).tobytes())
+            ks = b''.join(parts)
+        out = (np.frombuffer(data, dtype=np.uint8) ^ np.frombuffer(ks, dtype=np.uint8, count=n)).tobytes()
+        self._keystream = ks[n:]
+        self._text_len += n
+        return out
+
+    def _absorb_ciphertext(self, ciphertext):
+        data = self._ghash_buffer + ciphertext
+        whole = len(data) - len(data) % BLOCK_SIZE
+        self._y = ghash_blocks(self._tables, self._y, data[:whole])
+        self._ghash_buffer = data[whole:]
+
+    def _tag(self):
+        self._close_aad()
+        if self._ghash_buffer:
+            padded = self._ghash_buffer + bytes(BLOCK_SIZE - len(self._ghash_buffer))
+            self._y = ghash_blocks(self._tables, self._y, padded)
+        lengths = (8 * self._aad_len).to_bytes(8, 'big') + (8 * self._text_len).to_bytes(8, 'big')
+        s = ghash_blocks(self._tables, self._y, lengths)
+        ek_j0 = int.from_bytes(self._cipher.encrypt_block(self._j0), 'big')
+        return (s ^ ek_j0).to_bytes(BLOCK_SIZE, 'big')
+
+    def _check_open(self):
+        if self._finalized:
+            raise ValueError("Context was already finalized")
+
+
+class GCMEncryptor(_GCMContext):
+    """Incremental AES-GCM encryption: update() returns ciphertext, finalize() the tag."""
+
+    def update(self, data):
+        """
+        Encrypt the next chunk of plaintext.
+
+        Args:
+            data (bytes-like): Plaintext chunk of any length
+
+        Returns:
+            bytes: Ciphertext of the same length
+        """
+        self._check_open()
+        self._close_aad()
+        ciphertext = self._xor_keystream(bytes(data))
+        self._absorb_ciphertext(ciphertext)
+        return ciphertext
+
+    def finalize(self, tag_length=16):
+        """
+        Finish the message and compute its authentication tag.
+
+        Args:
+            tag_length (int): Tag length in bytes, 4 to 16 (default: 16)
+
+        Returns:
+            bytes: Authentication tag
+        """
+        if not 4 <= tag_length <= 16:
+            raise ValueError("Tag length must be 4 to 16 bytes")
+        self._check_open()
+        self._finalized = True
+        return self._tag()[:tag_length]
+
+
+class GCMDecryptor(_GCMContext):
+    """
+    Incremental AES-GCM decryption: update() returns plaintext, finalize(tag) verifies.
+
+    Plaintext returned by update() must not be used until finalize() succeeds.
+    """
+
+    def update(self, data):
+        """
+        Decrypt the next chunk of ciphertext.
+
+        Args:
+            data (bytes-like): Ciphertext chunk of any length
+
+        Returns:
+            bytes: Unverified plaintext of the same length
+        """
+        self._check_open()
+        self._close_aad()
+        ciphertext = bytes(data)
+        self._absorb_ciphertext(ciphertext)
+        return self._xor_keystream(ciphertext)
+
+    def finalize(self, tag):
+        """
+        Verify the authentication tag of the whole message.
+
+        Args:
+            tag (bytes): Tag received with the ciphertext (4 to 16 bytes)
+
+        Raises:
+            ValueError: If the tag does not match
+        """
+        self._check_open()
+        self._finalized = True
+        if not 4 <= len(tag) <= 16 or not hmac.compare_digest(self._tag()[:len(tag)], bytes(tag)):
+            raise ValueError("Authentication tag mismatch")
+
+
+class AESGCM:
+    """
+    AES-GCM with a cached key schedule and GHASH tables.
+
+    Args:
+        key (bytes): 16, 24 or 32 byte AES key
+
+    Example:
+        >>> gcm = AESGCM(bytes(16))
+        >>> sealed = gcm.encrypt(bytes(12), b"attack at dawn", b"header")
+        >>> gcm.decrypt(bytes(12), sealed, b"header")
+        b'attack at dawn'
+    """
+
+    tag_length = 16
+
+    def __init__(self, key):
+        self.key = bytes(key)
+        _key_context(self.key)
+
+    def encryptor(self, iv, aad=b''):
+        """Start an incremental encryption (see GCMEncryptor)."""
+        return GCMEncryptor(self.key, iv, aad)
+
+    def decryptor(self, iv, aad=b''):
+        """Start an incremental decryption (see GCMDecryptor)."""
+        return GCMDecryptor(self.key, iv, aad)
+
+    def encrypt(self, iv, plaintext, aad=b''):
+        """
+        One-shot encryption.
+
+        Returns:
+            bytes: ciphertext || 16-byte tag
+        """
+        enc = self.encryptor(iv, aad)
+        return enc.update(plaintext) + enc.finalize()
+
+    def decrypt(self, iv, data, aad=b''):
+        """
+        One-shot decryption of ciphertext || tag.
+
+        Returns:
+            bytes: Verified plaintext
+
+        Raises:
+            ValueError: If the tag does not match
+        """
+        if len(data) < self.tag_length:
+            raise ValueError("Data is shorter than the authentication tag")
+        dec = self.decryptor(iv, aad)
+        plaintext = dec.update(data[:-self.tag_length])
+        dec.finalize(data[-self.tag_length:])
+        return plaintext
@@ -0,0 +1,103 @@
+"""
+AES S-box Generation
+
+Derives the AES S-box and inverse S-box from the GF(2^8) log/antilog tables
+in gf256.py followed by the affine transformation written as an 8x8 bit
+matrix over GF(2):
+
+    S(a) = M * a^-1 + c        (a^-1 = 0 when a = 0)
+
+Results are memoized per irreducible polynomial, so experimenting with
+alternative polynomials only pays for the derivation once.
+"""
+
+from functools import lru_cache
+
+from gf256 import AES_MODULUS, inverse_table
+
+# Affine transformation matrix, row i selects the input bits that are XORed
+# into output bit i: b'_i = b_i ^ b_(i+4) ^ b_(i+5) ^ b_(i+6) ^ b_(i+7)
+# Each row is stored as a bitmask (bit j set -> b_j takes part)
+AFFINE_MATRIX = tuple(
+    (1 << i) | (1 << ((i + 4) % 8)) | (1 << ((i + 5) % 8)) | (1 << ((i + 6) % 8)) | (1 << ((i + 7) % 8))
+    for i in range(8)
+)
+
+# c = 0x63 = 01100011, removes the fixed points of the inverse map
+AFFINE_CONSTANT = 0x63
+
+# Inverse affine transformation: b_i = b'_(i+2) ^ b'_(i+5) ^ b'_(i+7) ^ d_i
+INVERSE_AFFINE_MATRIX = tuple(
+    (1 << ((i + 2) % 8)) | (1 << ((i + 5) % 8)) | (1 << ((i + 7) % 8))
+    for i in range(8)
+)
+
+# d = 0x05, the constant of the inverse affine transformation
+INVERSE_AFFINE_CONSTANT = 0x05
+
+
+def affine_transform(byte, matrix=AFFINE_MATRIX, constant=AFFINE_CONSTANT):
+    """
+    Apply a GF(2) affine transformation to a byte.
+
+    Output bit i is the parity of (row_i AND byte), XORed with bit i of the
+    constant.
+
+    Args:
+        byte (int): Input byte (0-255)
+        matrix (tuple): 8 row bitmasks (default: AES forward matrix)
+        constant (int): Constant vector c (default: 0x63)
+
+    Returns:
+        int: Transformed byte
+
+    Example:
+        >>> hex(affine_transform(0xCA))
+        '0xed'
+    """
+    out = 0
+    for i, row in enumerate(matrix):
+        out |= ((row & byte).bit_count() & 1) << i
+    return out ^ constant
+
+
+@lru_cache(maxsize=None)
+def create_sbox(poly=AES_MODULUS):
+    """
+    Build the S-box for an irreducible polynomial.
+
+    Args:
+        poly (int): Irreducible polynomial of degree 8 (default: 0x11B)
+
+    Returns:
+        bytes: 256-entry S-box, sbox[a] = affine(a^-1)
+
+    Example:
+        >>> hex(create_sbox()[0x1A])
+        '0xa2'
+    """
+    inv = inverse_table(poly)
+    return bytes(affine_transform(inv[a]) for a in range(256))
+
+
+@lru_cache(maxsize=None)
+def create_inverse_sbox(poly=AES_MODULUS):
+    """
+    Build the inverse S-box for an irreducible polynomial.
+
+    Args:
+        poly (int): Irreducible polynomial of degree 8 (default: 0x11B)
+
+    Returns:
+        bytes: 256-entry inverse S-box, inv_sbox[b] = (affine^-1(b))^-1
+    """
+    inv = inverse_table(poly)
+    return bytes(
+        inv[affine_transform(b, INVERSE_AFFINE_MATRIX, INVERSE_AFFINE_CONSTANT)]
+        for b in range(256)
+    )
+
+
+# AES S-boxes for m(x) = 0x11B, computed once at import
+AES_SBOX = create_sbox(AES_MODULUS)
+AES_INV_SBOX = create_inverse_sbox(AES_MODULUS)
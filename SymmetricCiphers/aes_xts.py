@@ -0,0 +1,250 @@
+"""
+XTS-AES for Sector-Addressable Storage (IEEE 1619 / NIST SP 800-38E)
+
+Disk images need random access: changing one sector must not require
+re-encrypting anything else, which CBC or CTR over the whole file cannot
+offer. XTS encrypts every sector (data unit) on its own, with a tweak
+derived from the sector number:
+
+    T     = E_K2(sector number, 16 bytes little-endian)
+    T_j   = T * alpha^j                  in GF(2^128), block j of the sector
+    C_j   = E_K1(P_j XOR T_j) XOR T_j
+
+Multiplying by alpha is a 1-bit left shift of the little-endian 128-bit
+value with a conditional XOR of 0x87, so the tweaks of a sector are computed
+incrementally ("doubling") from T. Here this is done for all sectors of a
+range at once, as two uint64 halves per tweak, and the blocks of all
+sectors go through aes_batch.BatchAES together.
+
+Sectors are independent, so a sector range of an image file is split over
+worker processes that each map the file and rewrite only their sectors.
+Sector sizes must be a multiple of 16 bytes (no ciphertext stealing).
+"""
+
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from aes_batch import BatchAES
+from aes_core import BLOCK_SIZE
+
+# Common sector size of disk images
+DEFAULT_SECTOR_SIZE = 512
+
+# Bytes processed per batch inside a worker, bounds its memory use
+CHUNK_SIZE = 1024 * 1024
+
+# Sectors handed to one worker task are at least this many bytes
+DEFAULT_SEGMENT_SIZE = 16 * 1024 * 1024
+
+# Ranges smaller than this are processed in the calling process
+PARALLEL_THRESHOLD = 4 * 1024 * 1024
+
+# x^128 = x^7 + x^2 + x + 1 in GF(2^128)
+XTS_REDUCTION = 0x87
+
+
+def double_tweaks(lo, hi):
+    """
+    Multiply tweaks by alpha: 128-bit little-endian left shift with reduction.
+
+    Args:
+        lo (np.ndarray): uint64 low halves (bytes 0..7 of each tweak)
+        hi (np.ndarray): uint64 high halves (bytes 8..15)
+
+    Returns:
+        tuple: (lo, hi) of the doubled tweaks
+    """
+    carry = hi >> np.uint64(63)
+    hi = (hi << np.uint64(1)) | (lo >> np.uint64(63))
+    lo = (lo << np.uint64(1)) ^ (carry * np.uint64(XTS_REDUCTION))
+    return lo, hi
+
+
+class XTSAES:
+    """
+    XTS-AES-128 / XTS-AES-256.
+
+    Args:
+        key (bytes): K1 || K2, 32 or 64 bytes (K1 encrypts data, K2 the sector numbers)
+        sector_size (int): Data unit size in bytes, a multiple of 16 (default: 512)
+
+    Example:
+        >>> xts = XTSAES(bytes(range(32)))
+        >>> sector = bytes(512)
+        >>> xts.decrypt_sectors(xts.encrypt_sectors(sector, 7), 7) == sector
+        True
+    """
+
+    def __init__(self, key, sector_size=DEFAULT_SECTOR_SIZE):
+        if len(key) not in (32, 64):
+            raise ValueError("XTS-AES key must be 32 or 64 bytes (two AES keys)")
+        if sector_size <= 0 or sector_size % BLOCK_SIZE:
+            raise ValueError(f"Sector size must be a positive multiple of {BLOCK_SIZE}")
+        half = len(key) // 2
+        if key[:half] == key[half:]:
+            raise ValueError("K1 and K2 must differ")
+        self.data_cipher = BatchAES(key[:half])
+        self.tweak_cipher = BatchAES(key[half:])
+        self.sector_size = sector_size
+        self.blocks_per_sector = sector_size // BLOCK_SIZE
+
+    def sector_tweaks(self, first_sector, n_sectors):
+        """
+        Tweaks T * alpha^j of every block of consecutive sectors.
+
+        Args:
+            first_sector (int): Number of the first sector
+            n_sectors (int): Number of sectors
+
+        Returns:
+            np.ndarray: (n_sectors * blocks_per_sector, 16) uint8 tweaks
+        """
+        numbers = np.zeros((n_sectors, 2), dtype='<u8')
+        numbers[:, 0] = np.arange(first_sector, first_sector + n_sectors, dtype=np.uint64)
+        t = np.ascontiguousarray(self.tweak_cipher.encrypt_states(numbers.view(np.uint8))).view('<u8')
+        lo, hi = t[:, 0].copy(), t[:, 1].copy()
+
+        tweaks = np.empty((n_sectors, self.blocks_per_sector, 2), dtype='<u8')
+        for j in range(self.blocks_per_sector):
+            tweaks[:, j, 0] = lo
+            tweaks[:, j, 1] = hi
+            lo, hi = double_tweaks(lo, hi)
+        return tweaks.view(np.uint8).reshape(-1, BLOCK_SIZE)
+
+    def crypt_states(self, states, first_sector, encrypting):
+        """
+        Encrypt or decrypt whole sectors given as an (N, 16) uint8 array.
+
+        Args:
+            states (np.ndarray): Blocks of consecutive sectors
+            first_sector (int): Number of the sector of states[0]
+            encrypting (bool): Encrypt (True) or decrypt (False)
+
+        Returns:
+            np.ndarray: New (N, 16) uint8 array
+        """
+        tweaks = self.sector_tweaks(first_sector, len(states) // self.blocks_per_sector)
+        cipher = self.data_cipher.encrypt_states if encrypting else self.data_cipher.decrypt_states
+        out = cipher(states ^ tweaks)
+        out ^= tweaks
+        return out
+
+    def _crypt(self, data, first_sector, encrypting):
+        if len(data) % self.sector_size:
+            raise ValueError(f"Data must be whole sectors of {self.sector_size} bytes")
+        states = np.frombuffer(data, dtype=np.uint8).reshape(-1, BLOCK_SIZE)
+        return self.crypt_states(states, first_sector, encrypting).tobytes()
+
+    def encrypt_sectors(self, data, first_sector):
+        """Encrypt whole sectors starting at sector first_sector."""
+        return self._crypt(data, first_sector, True)
+
+    def decrypt_sectors(self, data, first_sector):
+        """Decrypt whole sectors starting at sector first_sector."""
+        return self._crypt(data, first_sector, False)
+
+
+@lru_cache(maxsize=32)
+def _xts(key, sector_size):
+    """Key schedules cached per process, reused by every segment of that key."""
+    return XTSAES(key, sector_size)
+
+
+def _crypt_sector_segment(key, sector_size, path, first_sector, n_sectors, encrypting):
+    """Worker: rewrite sectors [first_sector, first_sector + n_sectors) of the mapped file in place."""
+    xts = _xts(key, sector_size)
+    chunk_sectors = max(1, CHUNK_SIZE // sector_size)
+    with open(path, 'r+b') as f:
+        image = mmap.mmap(f.fileno(), 0)
+        try:
+            data = np.frombuffer(image, dtype=np.uint8)
+            for sector in range(first_sector, first_sector + n_sectors, chunk_sectors):
+                count = min(chunk_sectors, first_sector + n_sectors - sector)
+                view = data[sector * sector_size:(sector + count) * sector_size].reshape(-1, BLOCK_SIZE)
+                view[:] = xts.crypt_states(view, sector, encrypting)
+            del data, view
+            image.flush()
+        finally:
+            image.close()
+    return n_sectors
+
+
+def crypt_image(key, path, first_sector=0, n_sectors=None, encrypting=True,
+                sector_size=DEFAULT_SECTOR_SIZE, workers=None, segment_size=DEFAULT_SEGMENT_SIZE):
+    """
+    Encrypt or decrypt a sector range of an image file in place.
+
+    Only the bytes of the requested sectors are read and written; the file
+    is memory-mapped and the range is split over worker processes.
+
+    Args:
+        key (bytes): XTS key K1 || K2 (32 or 64 bytes)
+        path (str): Image file, its size must be a multiple of sector_size
+        first_sector (int): First sector of the range (default: 0)
+        n_sectors (int, optional): Number of sectors (default: to the end of the file)
+        encrypting (bool): Encrypt (True) or decrypt (False)
+        sector_size (int): Sector size in bytes (default: 512)
+        workers (int, optional): Worker processes (default: os.cpu_count())
+        segment_size (int): Bytes per worker task (default: 16 MiB)
+
+    Returns:
+        int: Number of sectors processed
+
+    Raises:
+        ValueError: If the range is outside the image
+    """
+    XTSAES(key, sector_size)  # validate key and sector size up front
+    total = os.path.getsize(path) // sector_size
+    if n_sectors is None:
+        n_sectors = total - first_sector
+    if first_sector < 0 or n_sectors < 0 or first_sector + n_sectors > total:
+        raise ValueError(f"Sectors [{first_sector}, {first_sector + n_sectors}) are outside "
+                         f"the image ({total} sectors)")
+    if n_sectors == 0:
+        return 0
+
+    per_task = max(1, segment_size // sector_size)
+    tasks = [(bytes(key), sector_size, path, s, min(per_task, first_sector + n_sectors - s), encrypting)
+             for s in range(first_sector, first_sector + n_sectors, per_task)]
+
+    if n_sectors * sector_size < PARALLEL_THRESHOLD or workers == 1 or len(tasks) == 1:
+        return sum(_crypt_sector_segment(*task) for task in tasks)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(_crypt_sector_segment, *zip(*tasks)))
+
+
+def read_sectors(key, path, first_sector, n_sectors, sector_size=DEFAULT_SECTOR_SIZE):
+    """
+    Decrypt a sector range of an encrypted image without touching the rest.
+
+    Returns:
+        bytes: Plaintext of the sectors
+    """
+    with open(path, 'rb') as f:
+        f.seek(first_sector * sector_size)
+        data = f.read(n_sectors * sector_size)
+    if len(data) != n_sectors * sector_size:
+        raise ValueError("Sector range is outside the image")
+    return _xts(bytes(key), sector_size).decrypt_sectors(data, first_sector)
+
+
+def write_sectors(key, path, first_sector, data, sector_size=DEFAULT_SECTOR_SIZE):
+    """
+    Encrypt whole sectors and write them at their place in the image.
+
+    Args:
+        key (bytes): XTS key K1 || K2
+        path (str): Image file (must already exist)
+        first_sector (int): Sector of data[0]
+        data (bytes-like): Plaintext, whole sectors
+        sector_size (int): Sector size in bytes (default: 512)
+    """
+    ciphertext = _xts(bytes(key), sector_size).encrypt_sectors(data, first_sector)
+    with open(path, 'r+b') as f:
+        f.seek(first_sector * sector_size)
+        f.write(ciphertext)
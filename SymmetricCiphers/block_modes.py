@@ -0,0 +1,682 @@
+"""
+Block Cipher Modes of Operation Engine
+
+Implements the modes described in Block-Cipher-modes.py (ECB, CBC, CFB, OFB
+and CTR, plus CFB with s-bit segments such as CFB-1 and CFB-8) on top of any
+block cipher object that offers:
+
+    block_size                 block length in bytes (8 for DES, 16 for AES)
+    encrypt_block(block)       bytes -> bytes
+    decrypt_block(block)       bytes -> bytes
+
+e.g. aes_engine.AES, aes_batch.BatchAES or the DES adapters in
+des_adapters.py. Encryption and decryption are incremental:
+
+    enc = encryptor(AES(key), 'CBC', iv)
+    for chunk in chunks:
+        out.write(enc.update(chunk))
+    out.write(enc.finalize())
+
+update() only keeps the trailing partial block between calls, so streams of
+any size are processed with constant memory. ECB and CBC use PKCS#7 padding
+by default; CFB, OFB and CTR are stream modes and need no padding. CBC can
+instead use ciphertext stealing (padding='cs3', NIST SP 800-38A addendum
+CBC-CS3), which keeps the ciphertext exactly as long as the plaintext.
+
+The message itself is never copied to pad it: the last one or two blocks
+are held back and handled as small memoryview slices in finalize(), and
+whole blocks in between are passed on as slices of the caller's buffer.
+
+Block cipher calls that do not depend on each other are done in bulk:
+ECB in both directions, CBC decryption (P_i = D(C_i) XOR C_(i-1)) and CFB
+decryption (P_i = C_i XOR E(C_(i-1))) only need ciphertext that is already
+known. These go to the cipher's encrypt_blocks/decrypt_blocks when it has
+them (aes_batch.BatchAES), otherwise large inputs are split over a process
+pool and small ones are processed sequentially. Encryption in CBC/CFB and
+OFB in both directions are inherently sequential.
+"""
+
+import atexit
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+MODES = ('ECB', 'CBC', 'CFB', 'OFB', 'CTR')
+
+# CFB with a segment size s in bits smaller than the block ("CFB1", "CFB8", "CFB64", ...);
+# "CFB<block bits>" is plain CFB
+SEGMENT_MODES = ('CFB1', 'CFB8', 'CFB64')
+
+# Most CTR keystream blocks generated per call when the cipher can batch
+CTR_BATCH_BLOCKS = 1024
+
+# Inputs of at least this many bytes are spread over worker processes
+PARALLEL_THRESHOLD = 1024 * 1024
+
+# Bytes handed to one worker task (rounded down to whole blocks)
+PARALLEL_SEGMENT_SIZE = 256 * 1024
+
+# One pool per worker count, created on first use and reused across calls
+# (shut down by shutdown_pools, at the latest when the interpreter exits)
+_POOLS = {}
+
+# Values of the padding argument (True = PKCS7, False/None = no padding)
+PADDING_PKCS7 = 'pkcs7'
+PADDING_CS3 = 'cs3'
+
+
+def xor_bytes(a, b):
+    """XOR two equal-length bytes-like objects."""
+    return (int.from_bytes(a, 'big') ^ int.from_bytes(b, 'big')).to_bytes(len(a), 'big')
+
+
+def pkcs7_pad(tail, block_size):
+    """
+    PKCS#7-pad the last partial block.
+
+    Args:
+        tail (bytes): Final 0 .. block_size - 1 bytes of the message
+        block_size (int): Block size in bytes
+
+    Returns:
+        bytearray: One full block, tail + n copies of the byte n
+    """
+    n = block_size - len(tail)
+    block = bytearray([n]) * block_size
+    block[:len(tail)] = tail
+    return block
+
+
+def pkcs7_unpad(block, block_size):
+    """
+    Strip PKCS#7 padding from the last decrypted block.
+
+    Raises:
+        ValueError: If the padding is malformed
+    """
+    block = memoryview(block)
+    n = block[-1]
+    if not 1 <= n <= block_size or block[-n:] != bytes([n]) * n:
+        raise ValueError("Invalid PKCS#7 padding")
+    return bytes(block[:-n])
+
+
+def _blocks_sequential(cipher, data, encrypting):
+    """Apply the raw block function to every block of data, one by one."""
+    bs = cipher.block_size
+    into = getattr(cipher, 'encrypt_block_into' if encrypting else 'decrypt_block_into', None)
+    if into is not None:
+        out = bytearray(len(data))
+        for pos in range(0, len(data), bs):
+            into(data, out, pos, pos)
+        return bytes(out)
+    block = cipher.encrypt_block if encrypting else cipher.decrypt_block
+    return b''.join(block(data[pos:pos + bs]) for pos in range(0, len(data), bs))
+
+
+def _get_pool(workers):
+    if workers not in _POOLS:
+        _POOLS[workers] = ProcessPoolExecutor(max_workers=workers)
+    return _POOLS[workers]
+
+
+@atexit.register
+def shutdown_pools():
+    """Shut down the worker pools of apply_blocks; later calls create new ones."""
+    while _POOLS:
+        _, pool = _POOLS.popitem()
+        pool.shutdown()
+
+
+def apply_blocks(cipher, data, encrypting, workers=None):
+    """
+    Apply the block cipher to independent blocks (ECB-style), as fast as possible.
+
+    Uses the cipher's own batch method when it has one, a process pool for
+    inputs of at least PARALLEL_THRESHOLD bytes, and a plain loop otherwise.
+    Output blocks are always in input order.
+
+    Args:
+        cipher: Block cipher object
+        data (bytes-like): Whole blocks
+        encrypting (bool): Encrypt (True) or decrypt (False) every block
+        workers (int, optional): Worker processes (default: os.cpu_count(), 1 disables the pool)
+
+    Returns:
+        bytes: Processed blocks
+    """
+    batch = getattr(cipher, 'encrypt_blocks' if encrypting else 'decrypt_blocks', None)
+    if batch is not None:
+        return bytes(batch(bytes(data)))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(data) < PARALLEL_THRESHOLD:
+        return _blocks_sequential(cipher, data, encrypting)
+
+    bs = cipher.block_size
+    step = max(bs, PARALLEL_SEGMENT_SIZE - PARALLEL_SEGMENT_SIZE % bs)
+    segments = [bytes(data[pos:pos + step]) for pos in range(0, len(data), step)]
+    results = _get_pool(workers).map(_blocks_sequential, [cipher] * len(segments), segments,
+                                     [encrypting] * len(segments))
+    return b''.join(results)
+
+
+def _check_iv(iv, block_size, mode):
+    if iv is None or len(iv) != block_size:
+        raise ValueError(f"{mode} mode needs an IV of {block_size} bytes")
+    return bytes(iv)
+
+
+# ---------------------------------------------------------------------------
+# Whole-block modes (ECB, CBC): process data whose length is a multiple of the
+# block size; the contexts below take care of buffering and padding
+# ---------------------------------------------------------------------------
+
+class ECBMode:
+    """Electronic Codebook: every block is encrypted independently."""
+
+    name = 'ECB'
+    is_stream = False
+
+    def __init__(self, cipher, iv=None, workers=None):
+        self.cipher = cipher
+        self.block_size = cipher.block_size
+        self.workers = workers
+
+    def encrypt_blocks(self, data):
+        return apply_blocks(self.cipher, data, True, self.workers)
+
+    def decrypt_blocks(self, data):
+        return apply_blocks(self.cipher, data, False, self.workers)
+
+
+class CBCMode:
+    """Cipher Block Chaining: C_i = E(P_i XOR C_(i-1)), C_0 = IV."""
+
+    name = 'CBC'
+    is_stream = False
+
+    def __init__(self, cipher, iv, workers=None):
+        self.cipher = cipher
+        self.block_size = cipher.block_size
+        self.workers = workers
+        self._prev = _check_iv(iv, self.block_size, self.name)
+
+    def encrypt_blocks(self, data):
+        bs = self.block_size
+        into = getattr(self.cipher, 'encrypt_block_into', None)
+        if into is None:
+            encrypt = self.cipher.encrypt_block
+            prev = self._prev
+            out = []
+            for pos in range(0, len(data), bs):
+                prev = encrypt(xor_bytes(data[pos:pos + bs], prev))
+                out.append(prev)
+            self._prev = prev
+            return b''.join(out)
+
+        # Each ciphertext block goes straight into one preallocated buffer,
+        # so a window costs one allocation instead of a bytes object per block
+        out = bytearray(len(data))
+        prev = int.from_bytes(self._prev, 'big')
+        for pos in range(0, len(data), bs):
+            block = int.from_bytes(data[pos:pos + bs], 'big') ^ prev
+            into(block.to_bytes(bs, 'big'), out, 0, pos)
+            prev = int.from_bytes(out[pos:pos + bs], 'big')
+        if out:
+            self._prev = bytes(out[-bs:])
+        return bytes(out)
+
+    def decrypt_blocks(self, data):
+        # P_i = D(C_i) XOR C_(i-1): every D(C_i) is independent, so decrypt all
+        # blocks in bulk and XOR with the ciphertext shifted by one block
+        if not data:
+            return b''
+        bs = self.block_size
+        data = memoryview(data)
+        decrypted = memoryview(apply_blocks(self.cipher, data, False, self.workers))
+        out = xor_bytes(decrypted[:bs], self._prev) + xor_bytes(decrypted[bs:], data[:-bs])
+        self._prev = bytes(data[-bs:])
+        return out
+
+    def encrypt_final_cs3(self, tail):
+        """
+        Encrypt the last 1 + d/bs blocks with ciphertext stealing (CBC-CS3).
+
+        The partial block P_n* is zero-filled to P_n, and the last two
+        ciphertext blocks are swapped: ... C_(n-2), C_n, C_(n-1)* where
+        C_(n-1)* is C_(n-1) truncated to d = len(P_n*) bytes.
+
+        Args:
+            tail (bytes-like): P_(n-1) || P_n*, bs + 1 .. 2 * bs bytes
+
+        Returns:
+            bytes: C_n || C_(n-1)*, as long as tail
+        """
+        bs = self.block_size
+        tail = memoryview(tail)
+        d = len(tail) - bs
+        c_prev = self.encrypt_blocks(tail[:bs])
+        last = bytearray(bs)
+        last[:d] = tail[bs:]
+        return self.encrypt_blocks(last) + c_prev[:d]
+
+    def decrypt_final_cs3(self, tail):
+        """
+        Decrypt the last two (swapped) blocks of a CBC-CS3 ciphertext.
+
+        Args:
+            tail (bytes-like): C_n || C_(n-1)*, bs + 1 .. 2 * bs bytes
+
+        Returns:
+            bytes: P_(n-1) || P_n*, as long as tail
+        """
+        bs = self.block_size
+        tail = memoryview(tail)
+        d = len(tail) - bs
+        c_stolen = tail[bs:]
+        # D(C_n) = P_n XOR C_(n-1); its last bs - d bytes complete C_(n-1)
+        z = self.cipher.decrypt_block(bytes(tail[:bs]))
+        c_prev = bytes(c_stolen) + z[d:]
+        p_prev = xor_bytes(self.cipher.decrypt_block(c_prev), self._prev)
+        self._prev = bytes(tail[:bs])
+        return p_prev + xor_bytes(z[:d], c_stolen)
+
+
+# ---------------------------------------------------------------------------
+# Stream modes (CFB, OFB, CTR): a keystream is XORed with the data, so any
+# length is accepted and partial keystream blocks carry over between calls
+# ---------------------------------------------------------------------------
+
+class _StreamMode:
+    """
+    Shared state of the stream modes and the keystream XOR loop.
+
+    Subclasses that use transform() define _next_keystream(n_needed), which
+    returns the next keystream bytes (at least one block), and may override
+    _feed() to see the ciphertext; CFBSegmentMode has its own transform().
+    """
+
+    is_stream = True
+
+    def __init__(self, cipher, iv, workers=None):
+        self.cipher = cipher
+        self.block_size = cipher.block_size
+        self.workers = workers
+        self._register = _check_iv(iv, self.block_size, self.name)
+        self._keystream = b''
+
+    def _feed(self, ciphertext):
+        """Receive the ciphertext produced with the current keystream."""
+
+    def transform(self, data, encrypting):
+        """XOR data with the keystream, continuing where the last call stopped."""
+        mv = memoryview(data)
+        n = len(mv)
+        out = []
+        pos = 0
+        while pos < n:
+            ks = self._keystream or self._next_keystream(n - pos)
+            take = min(len(ks), n - pos)
+            src = mv[pos:pos + take]
+            chunk = xor_bytes(src, ks[:take])
+            self._feed(chunk if encrypting else bytes(src))
+            self._keystream = ks[take:]
+            out.append(chunk)
+            pos += take
+        return b''.join(out)
+
+
+class CFBMode(_StreamMode):
+    """Cipher Feedback (full block): C_i = P_i XOR E(C_(i-1)), C_0 = IV."""
+
+    name = 'CFB'
+
+    def __init__(self, cipher, iv, workers=None):
+        super().__init__(cipher, iv, workers)
+        self._partial = b''
+
+    def _next_keystream(self, n_needed):
+        return self.cipher.encrypt_block(self._register)
+
+    def _feed(self, ciphertext):
+        # The shift register becomes the ciphertext block once it is complete
+        self._partial += ciphertext
+        if len(self._partial) == self.block_size:
+            self._register = self._partial
+            self._partial = b''
+
+    def transform(self, data, encrypting):
+        if encrypting:
+            return super().transform(data, True)
+        # Decryption: finish the current block, then E(C_(i-1)) for all whole
+        # blocks at once since the ciphertext feedback is already known
+        bs = self.block_size
+        mv = memoryview(data)
+        head = min(len(self._keystream), len(mv))
+        out = [super().transform(mv[:head], False)]
+        body = mv[head:]
+        whole = len(body) - len(body) % bs
+        if whole:
+            blocks = bytes(body[:whole])
+            keystream = apply_blocks(self.cipher, self._register + blocks[:-bs], True, self.workers)
+            out.append(xor_bytes(blocks, keystream))
+            self._register = blocks[-bs:]
+        out.append(super().transform(body[whole:], False))
+        return b''.join(out)
+
+
+class CFBSegmentMode(_StreamMode):
+    """
+    Cipher Feedback with s-bit segments (CFB-s, NIST SP 800-38A section 6.3).
+
+    Each segment is XORed with the top s bits of E(register), then the
+    register shifts left by s bits and takes in the ciphertext segment.
+    The register is kept as one int, so this is a shift and a mask. CFB-1
+    works bit by bit (MSB first) and CFB-8 byte by byte, each in its own
+    loop; larger byte segments carry partial segments over between calls.
+
+    Args:
+        cipher: Block cipher object
+        iv (bytes): Initial register of block_size bytes
+        workers: Unused (every segment depends on the previous one)
+        segment_bits (int): s, 1 or a multiple of 8 below the block size in bits
+    """
+
+    name = 'CFB'
+
+    def __init__(self, cipher, iv, workers=None, segment_bits=8):
+        super().__init__(cipher, iv, workers)
+        block_bits = 8 * self.block_size
+        if segment_bits != 1 and (segment_bits % 8 or not 0 < segment_bits < block_bits):
+            raise ValueError(f"CFB segment size must be 1 or a multiple of 8 below {block_bits} bits")
+        self.segment_bits = segment_bits
+        self.name = f'CFB{segment_bits}'
+        self._reg = int.from_bytes(self._register, 'big')
+        self._mask = (1 << block_bits) - 1
+        self._partial = b''
+
+    def _top_bytes(self, reg):
+        """E(register) as bytes."""
+        return self.cipher.encrypt_block(reg.to_bytes(self.block_size, 'big'))
+
+    def transform(self, data, encrypting):
+        if self.segment_bits == 1:
+            return self._transform_bits(data, encrypting)
+        if self.segment_bits == 8:
+            return self._transform_bytes(data, encrypting)
+        return self._transform_segments(data, encrypting)
+
+    def _transform_bytes(self, data, encrypting):
+        encrypt, bs, mask = self.cipher.encrypt_block, self.block_size, self._mask
+        reg = self._reg
+        out = bytearray(data)
+        for n, x in enumerate(out):
+            y = x ^ encrypt(reg.to_bytes(bs, 'big'))[0]
+            out[n] = y
+            reg = ((reg << 8) | (y if encrypting else x)) & mask
+        self._reg = reg
+        return bytes(out)
+
+    def _transform_bits(self, data, encrypting):
+        encrypt, bs, mask = self.cipher.encrypt_block, self.block_size, self._mask
+        reg = self._reg
+        out = bytearray(data)
+        for n, x in enumerate(out):
+            y = 0
+            for shift in range(7, -1, -1):
+                p = (x >> shift) & 1
+                c = p ^ (encrypt(reg.to_bytes(bs, 'big'))[0] >> 7)
+                y |= c << shift
+                reg = ((reg << 1) | (c if encrypting else p)) & mask
+            out[n] = y
+        self._reg = reg
+        return bytes(out)
+
+    def _transform_segments(self, data, encrypting):
+        seg = self.segment_bits // 8
+        mv = memoryview(data)
+        n = len(mv)
+        out = []
+        pos = 0
+        while pos < n:
+            ks = self._keystream or self._top_bytes(self._reg)[:seg]
+            take = min(len(ks), n - pos)
+            src = mv[pos:pos + take]
+            chunk = xor_bytes(src, ks[:take])
+            self._keystream = ks[take:]
+            self._partial += chunk if encrypting else bytes(src)
+            if len(self._partial) == seg:
+                self._reg = ((self._reg << self.segment_bits) | int.from_bytes(self._partial, 'big')) & self._mask
+                self._partial = b''
+            out.append(chunk)
+            pos += take
+        return b''.join(out)
+
+
+class OFBMode(_StreamMode):
+    """Output Feedback: O_i = E(O_(i-1)), O_0 = IV, C_i = P_i XOR O_i."""
+
+    name = 'OFB'
+
+    def _next_keystream(self, n_needed):
+        self._register = self.cipher.encrypt_block(self._register)
+        return self._register
+
+
+class CTRMode(_StreamMode):
+    """Counter: C_i = P_i XOR E(counter_0 + i), the IV is the initial counter block."""
+
+    name = 'CTR'
+
+    def __init__(self, cipher, iv, workers=None):
+        super().__init__(cipher, iv, workers)
+        self._counter = int.from_bytes(self._register, 'big')
+        self._modulus = 1 << (8 * self.block_size)
+
+    def _next_keystream(self, n_needed):
+        bs = self.block_size
+        count = min(-(-n_needed // bs), CTR_BATCH_BLOCKS)
+        first = self._counter
+        self._counter = (first + count) % self._modulus
+        counters = [((first + i) % self._modulus).to_bytes(bs, 'big') for i in range(count)]
+        if hasattr(self.cipher, 'encrypt_blocks'):
+            return bytes(self.cipher.encrypt_blocks(b''.join(counters)))
+        return b''.join(self.cipher.encrypt_block(c) for c in counters)
+
+
+_MODE_CLASSES = {cls.name: cls for cls in (ECBMode, CBCMode, CFBMode, OFBMode, CTRMode)}
+
+
+def create_mode(cipher, mode, iv=None, workers=None):
+    """
+    Instantiate a mode by name.
+
+    Args:
+        cipher: Block cipher object (block_size, encrypt_block, decrypt_block)
+        mode (str): One of MODES, or 'CFB<s>' for s-bit CFB segments ('CFB1', 'CFB8', ...)
+        iv (bytes, optional): IV / initial counter block (not used by ECB)
+        workers (int, optional): Worker processes for bulk block operations
+
+    Returns:
+        Mode object (ECBMode, CBCMode, CFBMode, CFBSegmentMode, OFBMode or CTRMode)
+    """
+    name = mode.upper()
+    if name[:3] == 'CFB' and name[3:].isdigit():
+        segment_bits = int(name[3:])
+        if segment_bits == 8 * cipher.block_size:
+            return CFBMode(cipher, iv, workers)
+        return CFBSegmentMode(cipher, iv, workers, segment_bits)
+    try:
+        cls = _MODE_CLASSES[name]
+    except KeyError:
+        raise ValueError(f"Unknown mode {mode!r}, expected one of {MODES} or CFB<s>") from None
+    return cls(cipher, iv, workers)
+
+
+class ModeContext:
+    """
+    Incremental encryptor/decryptor returned by encryptor() and decryptor().
+
+    update(chunk) returns the output that can already be produced and keeps
+    at most the trailing partial block (plus, when decrypting with PKCS#7,
+    the last full block, which holds the padding, or with CBC-CS3 the last
+    block before the partial one). finalize() returns the rest.
+    """
+
+    def __init__(self, mode, encrypting, padding=True):
+        self.mode = mode
+        self.encrypting = encrypting
+        self.padding = None if mode.is_stream else _padding_name(padding)
+        if self.padding == PADDING_CS3 and mode.name != 'CBC':
+            raise ValueError("Ciphertext stealing (cs3) is only defined for CBC")
+        self.block_size = mode.block_size
+        self._buffer = b''
+        self._finalized = False
+
+    def _process(self, data):
+        if self.encrypting:
+            return self.mode.encrypt_blocks(data)
+        return self.mode.decrypt_blocks(data)
+
+    def _ready(self, total):
+        """Number of leading bytes (whole blocks) of total that can be processed now."""
+        bs = self.block_size
+        if self.padding == PADDING_CS3:
+            # The last full block and the partial one are swapped in finalize()
+            return max(0, (total - bs - 1) // bs * bs)
+        whole = total - total % bs
+        if not self.encrypting and self.padding and whole == total and whole:
+            # Keep the last block: it may contain the padding
+            whole -= bs
+        return whole
+
+    def update(self, data):
+        """
+        Process the next chunk of input.
+
+        Args:
+            data (bytes-like): Chunk of any length
+
+        Returns:
+            bytes: Output produced so far
+        """
+        if self._finalized:
+            raise ValueError("Context was already finalized")
+        if self.mode.is_stream:
+            return self.mode.transform(data, self.encrypting)
+
+        bs = self.block_size
+        data = memoryview(data)
+        buffered = len(self._buffer)
+        whole = self._ready(buffered + len(data))
+        if whole <= buffered:
+            # Nothing of data is processed yet, it is small enough to buffer
+            out = self._process(self._buffer[:whole]) if whole else b''
+            self._buffer = self._buffer[whole:] + bytes(data)
+            return out
+
+        # Complete the buffered partial block with the head of data, then pass
+        # the remaining whole blocks on as a slice of the caller's buffer
+        used = whole - buffered
+        head = -buffered % bs
+        out = []
+        if buffered:
+            out.append(self._process(self._buffer + bytes(data[:head])))
+        if used > head:
+            out.append(self._process(data[head:used]))
+        self._buffer = bytes(data[used:])
+        return b''.join(out)
+
+    def finalize(self):
+        """
+        Flush the buffered input, adding or removing padding.
+
+        Returns:
+            bytes: Final output
+
+        Raises:
+            ValueError: If the input length or the padding is invalid
+        """
+        if self._finalized:
+            raise ValueError("Context was already finalized")
+        self._finalized = True
+        if self.mode.is_stream:
+            return b''
+
+        bs = self.block_size
+        tail = memoryview(self._buffer)
+        self._buffer = b''
+        if self.padding == PADDING_CS3:
+            if len(tail) < bs:
+                raise ValueError(f"CBC-CS3 needs at least one full block ({bs} bytes)")
+            if len(tail) == bs:
+                return self._process(tail)
+            if self.encrypting:
+                return self.mode.encrypt_final_cs3(tail)
+            return self.mode.decrypt_final_cs3(tail)
+        if self.encrypting:
+            if self.padding:
+                return self._process(pkcs7_pad(tail, bs))
+            if tail:
+                raise ValueError(f"Input is not a multiple of {bs} bytes (enable padding)")
+            return b''
+        if self.padding:
+            if len(tail) != bs:
+                raise ValueError(f"Ciphertext is not a multiple of {bs} bytes")
+            return pkcs7_unpad(self._process(tail), bs)
+        if tail:
+            raise ValueError(f"Ciphertext is not a multiple of {bs} bytes")
+        return b''
+
+
+def _padding_name(padding):
+    """Normalize the padding argument to PADDING_PKCS7, PADDING_CS3 or None."""
+    if padding is True:
+        return PADDING_PKCS7
+    if not padding:
+        return None
+    name = padding.lower()
+    if name not in (PADDING_PKCS7, PADDING_CS3):
+        raise ValueError(f"Unknown padding {padding!r}, expected True, False, 'pkcs7' or 'cs3'")
+    return name
+
+
+def encryptor(cipher, mode, iv=None, padding=True, workers=None):
+    """
+    Start an incremental encryption.
+
+    Args:
+        cipher: Block cipher object (block_size, encrypt_block, decrypt_block)
+        mode (str): 'ECB', 'CBC', 'CFB', 'OFB', 'CTR' or a CFB segment mode ('CFB1', 'CFB8', ...)
+        iv (bytes, optional): IV / initial counter block of block_size bytes
+        padding (bool | str): ECB/CBC padding: True or 'pkcs7' (default), 'cs3' for
+                              CBC ciphertext stealing, False for none
+        workers (int, optional): Worker processes for bulk block operations
+                                 (default: os.cpu_count(), 1 = sequential only)
+
+    Returns:
+        ModeContext: Object with update(chunk) and finalize()
+    """
+    return ModeContext(create_mode(cipher, mode, iv, workers), True, padding)
+
+
+def decryptor(cipher, mode, iv=None, padding=True, workers=None):
+    """
+    Start an incremental decryption (arguments as in encryptor()).
+
+    Returns:
+        ModeContext: Object with update(chunk) and finalize()
+    """
+    return ModeContext(create_mode(cipher, mode, iv, workers), False, padding)
+
+
+def encrypt(cipher, mode, data, iv=None, padding=True, workers=None):
+    """One-shot encryption of data with the given mode."""
+    ctx = encryptor(cipher, mode, iv, padding, workers)
+    return ctx.update(data) + ctx.finalize()
+
+
+def decrypt(cipher, mode, data, iv=None, padding=True, workers=None):
+    """One-shot decryption of data with the given mode."""
+    ctx = decryptor(cipher, mode, iv, padding, workers)
+    return ctx.update(data) + ctx.finalize()
@@ -0,0 +1,138 @@
+"""
+Byte-Oriented Adapters for the DES Family
+
+DES-algorithm.py and KE-DES-algorithm.py work on lists of bits. These
+adapters expose them through the small interface used by block_modes.py
+(the same one aes_engine.AES already offers):
+
+    block_size                 block length in bytes
+    encrypt_block(block)       bytes -> bytes
+    decrypt_block(block)       bytes -> bytes
+
+The subkeys are generated once in the constructor.
+"""
+
+import importlib.util
+import os
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_script(filename, module_name):
+    """
+    Import one of the hyphenated scripts of this folder as a module.
+
+    Args:
+        filename (str): Script file name, e.g. 'DES-algorithm.py'
+        module_name (str): Name to give the module
+
+    Returns:
+        module: The loaded module (its __main__ block is not run)
+    """
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(_HERE, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_des = load_script('DES-algorithm.py', 'des_algorithm')
+_ke_des = load_script('KE-DES-algorithm.py', 'ke_des_algorithm')
+
+
+def bytes_to_bits(data):
+    """Convert bytes to a list of bits, MSB first."""
+    value = int.from_bytes(data, 'big')
+    return [(value >> i) & 1 for i in reversed(range(8 * len(data)))]
+
+
+def bits_to_bytes(bits):
+    """Convert a list of bits (MSB first) back to bytes."""
+    value = 0
+    for bit in bits:
+        value = (value << 1) | bit
+    return value.to_bytes(len(bits) // 8, 'big')
+
+
+def _check_key(key, length=8):
+    if len(key) != length:
+        raise ValueError(f"Key must be {length} bytes long")
+
+
+class DESCipher:
+    """
+    DES (DES-algorithm.py) with bytes in and out.
+
+    Args:
+        key (bytes): 8-byte key (parity bits are ignored)
+
+    Example:
+        >>> des = DESCipher(bytes.fromhex('133457799BBCDFF1'))
+        >>> des.encrypt_block(bytes.fromhex('0123456789ABCDEF')).hex().upper()
+        '85E813540F0AB405'
+    """
+
+    block_size = 8
+
+    def __init__(self, key):
+        _check_key(key)
+        self._subkeys = _des.generateSubkeys(bytes_to_bits(key))
+        self._subkeys_decrypt = self._subkeys[::-1]
+
+    def encrypt_block(self, block):
+        """Encrypt one 8-byte block."""
+        return bits_to_bytes(_des.DES_encrypt(bytes_to_bits(block), self._subkeys))
+
+    def decrypt_block(self, block):
+        """Decrypt one 8-byte block."""
+        return bits_to_bytes(_des.DES_decrypt(bytes_to_bits(block), self._subkeys_decrypt))
+
+
+class TripleDESCipher:
+    """
+    3DES in EDE form: C = E_K3(D_K2(E_K1(P))), see 3DES-algorithm.py.
+
+    Args:
+        key (bytes): 16 bytes (2-key, K3 = K1) or 24 bytes (3-key)
+    """
+
+    block_size = 8
+
+    def __init__(self, key):
+        if len(key) not in (16, 24):
+            raise ValueError("Key must be 16 or 24 bytes long")
+        k1, k2 = key[:8], key[8:16]
+        k3 = key[16:24] if len(key) == 24 else k1
+        self._des1, self._des2, self._des3 = DESCipher(k1), DESCipher(k2), DESCipher(k3)
+
+    def encrypt_block(self, block):
+        """Encrypt one 8-byte block."""
+        return self._des3.encrypt_block(self._des2.decrypt_block(self._des1.encrypt_block(block)))
+
+    def decrypt_block(self, block):
+        """Decrypt one 8-byte block."""
+        return self._des1.decrypt_block(self._des2.encrypt_block(self._des3.decrypt_block(block)))
+
+
+class KEDESCipher:
+    """
+    Key-enhanced DES (KE-DES-algorithm.py) with bytes in and out.
+
+    Args:
+        key (bytes): 8-byte key
+    """
+
+    block_size = 8
+
+    def __init__(self, key):
+        _check_key(key)
+        self._key_bits = bytes_to_bits(key)
+        self._subkeys = _ke_des.generateSubkeys(list(self._key_bits))
+        self._subkeys_decrypt = self._subkeys[::-1]
+
+    def encrypt_block(self, block):
+        """Encrypt one 8-byte block."""
+        return bits_to_bytes(_ke_des.KE_DES_encrypt(bytes_to_bits(block), self._subkeys, self._key_bits))
+
+    def decrypt_block(self, block):
+        """Decrypt one 8-byte block."""
+        return bits_to_bytes(_ke_des.KE_DES_decrypt(bytes_to_bits(block), self._subkeys_decrypt, self._key_bits))
@@ -0,0 +1,309 @@
+"""
+ECB Pattern-Leakage Scanner
+
+ECB encrypts equal plaintext blocks to equal ciphertext blocks (see
+Block-Cipher-modes.py), so repeated ciphertext blocks are a strong hint that
+a file was encrypted in ECB mode. This scanner finds them in files of any
+size without a dict of bytes objects, within a fixed memory budget:
+
+    - the file is read in windows sized from the memory limit, and every
+      block becomes one (8-byte blocks) or two (16-byte blocks) uint64
+      words plus its index
+    - each window is sorted with NumPy (stable argsorts by block value, so
+      equal blocks stay in position order); if the file needs more than one window, the sorted runs are
+      appended to a single temporary file
+    - the runs are merged as a stream: a slice of every run is buffered,
+      everything up to the smallest last buffered record is sorted and
+      consumed, and the used buffers are refilled; equal blocks always end
+      up next to each other, however often a block repeats
+    - duplicates, repeat distances and group sizes come from comparing
+      neighbours of the sorted stream, carrying the last record (and the
+      size of its group) from one slice to the next
+
+The report has the duplicate-block ratio, a histogram of repeat distances
+(log2 buckets), a histogram of duplicate positions over the file (one row of
+a heatmap per file) and the most repeated blocks.
+
+Usage:
+    python ecb_scanner.py <file> [block size, 8 or 16]
+"""
+
+import heapq
+import mmap
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from formatting_utils import print_section_header
+
+# Approximate working memory of a scan
+DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024
+
+# Working memory per byte of sorted records (records, sort order, sorted
+# copy and neighbour comparisons); windows and merge buffers hold at most
+# memory_limit / WORK_FACTOR bytes of records
+WORK_FACTOR = 6
+
+# Records buffered per run at least while merging, however many runs there are
+MIN_MERGE_ROWS = 1024
+
+# Number of position bins of the duplicate histogram
+DEFAULT_BINS = 256
+
+# Most repeated blocks listed in the report
+TOP_BLOCKS = 10
+
+
+class ECBScanReport:
+    """
+    Result of scan_file().
+
+    Attributes:
+        block_size (int): Block size that was scanned
+        n_blocks (int): Whole blocks in the file
+        unique_blocks (int): Distinct blocks
+        distance_histogram (np.ndarray): distance_histogram[k] = repeats whose
+            distance to the previous equal block is in [2^k, 2^(k+1)) blocks
+        position_histogram (np.ndarray): Repeated blocks per equal-size region of the file
+        top_blocks (list): (count, block bytes) of the most repeated blocks
+    """
+
+    def __init__(self, block_size, n_blocks, unique_blocks, distance_histogram,
+                 position_histogram, top_blocks):
+        self.block_size = block_size
+        self.n_blocks = n_blocks
+        self.unique_blocks = unique_blocks
+        self.distance_histogram = distance_histogram
+        self.position_histogram = position_histogram
+        self.top_blocks = top_blocks
+
+    @property
+    def duplicate_blocks(self):
+        """Blocks equal to an earlier block."""
+        return self.n_blocks - self.unique_blocks
+
+    @property
+    def duplicate_ratio(self):
+        """Fraction of blocks that repeat an earlier block (about 0 for CBC/CTR/... output)."""
+        return self.duplicate_blocks / self.n_blocks if self.n_blocks else 0.0
+
+    def __repr__(self):
+        return (f"ECBScanReport(blocks={self.n_blocks}, unique={self.unique_blocks}, "
+                f"duplicate ratio={self.duplicate_ratio:.4f})")
+
+
+def _block_words(window, block_size):
+    """(N, words) uint64 view of the whole blocks of a bytes-like window."""
+    words = np.frombuffer(window, dtype='<u8')
+    return words.reshape(-1, block_size // 8)
+
+
+def _sort_records(records):
+    """
+    Sort (M, words + 1) records by block value, then by position (the last column).
+
+    Records must already be in position order among equal blocks (a window,
+    or slices of runs concatenated in run order): stable sorts by the block
+    words alone, least significant first, then keep that order.
+    """
+    order = np.arange(len(records))
+    for i in range(records.shape[1] - 2, -1, -1):
+        order = order[np.argsort(records[order, i], kind='stable')]
+    return records[order]
+
+
+def _count_until(records, fence):
+    """Number of leading rows of sorted records that sort at or before the fence row."""
+    before = records[:, -1] <= fence[-1]
+    for i in range(records.shape[1] - 2, -1, -1):
+        before = (records[:, i] < fence[i]) | ((records[:, i] == fence[i]) & before)
+    return int(np.count_nonzero(before))
+
+
+class _SortedStats:
+    """Accumulates the report from consecutive slices of the sorted records."""
+
+    def __init__(self, n_blocks, n_bins, top):
+        self.n_blocks = n_blocks
+        self.n_bins = n_bins
+        self.top = top
+        self.unique = 0
+        self.distances = np.zeros(64, dtype=np.int64)
+        self.positions = np.zeros(n_bins, dtype=np.int64)
+        self.top_blocks = []
+        # Last record seen and the size of its (still open) group of equal blocks
+        self._last = None
+        self._group = 0
+
+    def _close_groups(self, sizes, keys):
+        best = np.argsort(sizes, kind='stable')[::-1][:self.top]
+        found = [(int(sizes[i]), keys[i].astype('<u8').tobytes()) for i in best if sizes[i] > 1]
+        self.top_blocks = heapq.nlargest(self.top, self.top_blocks + found)
+
+    def add(self, records):
+        """records: (M, words + 1) uint64 sorted, continuing the previous slices."""
+        if not len(records):
+            return
+        keys = records[:, :-1]
+        positions = records[:, -1]
+        same = np.all(keys[1:] == keys[:-1], axis=1)
+        continues = self._last is not None and bool(np.array_equal(self._last[:-1], keys[0]))
+        self.unique += len(records) - int(np.count_nonzero(same)) - continues
+
+        repeat_positions = positions[1:][same]
+        distances = (positions[1:] - positions[:-1])[same]
+        if continues:
+            repeat_positions = np.append(positions[0], repeat_positions)
+            distances = np.append(positions[0] - self._last[-1], distances)
+        if len(distances):
+            buckets = np.floor(np.log2(distances.astype(np.float64))).astype(np.int64)
+            self.distances += np.bincount(buckets, minlength=64)[:64]
+            bins = (repeat_positions * np.uint64(self.n_bins) // np.uint64(self.n_blocks)).astype(np.int64)
+            self.positions += np.bincount(bins, minlength=self.n_bins)
+
+        # Starts of groups of equal blocks; the last group may continue in
+        # the next slice, so it stays open
+        starts = np.flatnonzero(np.concatenate(([not continues], ~same)))
+        if continues:
+            self._group += int(starts[0]) if len(starts) else len(records)
+        if len(starts):
+            if self._last is not None:
+                self._close_groups(np.array([self._group]), self._last[None, :-1])
+            sizes = np.diff(np.append(starts, len(records)))
+            self._close_groups(sizes[:-1], keys[starts[:-1]])
+            self._group = int(sizes[-1])
+        self._last = records[-1].copy()
+
+    def close(self):
+        """Account for the group that is still open after the last slice."""
+        if self._last is not None and self._group > 1:
+            self._close_groups(np.array([self._group]), self._last[None, :-1])
+        self._group = 0
+
+
+def _merge_runs(spill, runs, n_columns, rows_per_run):
+    """
+    Yield the records of sorted runs of a spill file in sorted order, slice by slice.
+
+    Args:
+        spill (file): Spill file opened for reading
+        runs (list): (first record, record count) of every run
+        n_columns (int): uint64 words per record
+        rows_per_run (int): Records buffered per run
+
+    Yields:
+        np.ndarray: Sorted (M, n_columns) slices; together all records, in order
+    """
+    record_bytes = 8 * n_columns
+    cursors = [list(run) for run in runs]
+    buffers = [np.empty((0, n_columns), dtype=np.uint64) for _ in runs]
+
+    while True:
+        for k, (first, left) in enumerate(cursors):
+            if not len(buffers[k]) and left:
+                count = min(rows_per_run, left)
+                spill.seek(first * record_bytes)
+                buffers[k] = np.fromfile(spill, dtype=np.uint64, count=count * n_columns).reshape(-1, n_columns)
+                cursors[k] = [first + count, left - count]
+        active = [k for k in range(len(runs)) if len(buffers[k])]
+        if not active:
+            return
+        # Records after the smallest last buffered record of an unfinished run
+        # may still be preceded by records that are not loaded yet
+        pending = [k for k in active if cursors[k][1]]
+        if pending:
+            lasts = np.array([buffers[k][-1] for k in pending])
+            fence = _sort_records(lasts)[0]
+        else:
+            fence = None
+        taken = []
+        for k in active:
+            n = len(buffers[k]) if fence is None else _count_until(buffers[k], fence)
+            taken.append(buffers[k][:n])
+            buffers[k] = buffers[k][n:]
+        yield _sort_records(np.concatenate(taken))
+
+
+def scan_file(path, block_size=16, memory_limit=DEFAULT_MEMORY_LIMIT, n_bins=DEFAULT_BINS,
+              top=TOP_BLOCKS, spill_dir=None):
+    """
+    Scan a ciphertext file for repeated blocks.
+
+    Args:
+        path (str): File to scan (a trailing partial block is ignored)
+        block_size (int): 8 (DES) or 16 (AES)
+        memory_limit (int): Approximate working memory in bytes (default: 256 MiB)
+        n_bins (int): Position bins of the duplicate histogram (default: 256)
+        top (int): Number of most repeated blocks to report (default: 10)
+        spill_dir (str, optional): Directory for the spill file (default: system temp)
+
+    Returns:
+        ECBScanReport: Duplicate statistics of the file
+    """
+    if block_size not in (8, 16):
+        raise ValueError("Block size must be 8 or 16 bytes")
+    n_blocks = os.path.getsize(path) // block_size
+    stats = _SortedStats(n_blocks, n_bins, top)
+    if n_blocks == 0:
+        return ECBScanReport(block_size, 0, 0, stats.distances, stats.positions, [])
+
+    n_words = block_size // 8
+    record_bytes = 8 * (n_words + 1)
+    budget_rows = max(1, memory_limit // (WORK_FACTOR * record_bytes))
+    window_blocks = min(n_blocks, budget_rows)
+
+    def sorted_windows():
+        with open(path, 'rb') as f:
+            for first in range(0, n_blocks, window_blocks):
+                count = min(window_blocks, n_blocks - first)
+                # Map only this window (offsets must be multiples of the granularity)
+                start = first * block_size - first * block_size % mmap.ALLOCATIONGRANULARITY
+                length = (first + count) * block_size - start
+                with mmap.mmap(f.fileno(), length, offset=start, access=mmap.ACCESS_READ) as data:
+                    records = np.empty((count, n_words + 1), dtype=np.uint64)
+                    records[:, :n_words] = _block_words(data[first * block_size - start:], block_size)
+                records[:, -1] = np.arange(first, first + count, dtype=np.uint64)
+                yield _sort_records(records)
+
+    if window_blocks == n_blocks:
+        for records in sorted_windows():
+            stats.add(records)
+    else:
+        with tempfile.TemporaryDirectory(dir=spill_dir) as tmp:
+            spill_path = os.path.join(tmp, 'runs.bin')
+            runs = []
+            with open(spill_path, 'wb') as spill:
+                for records in sorted_windows():
+                    runs.append((runs[-1][0] + runs[-1][1] if runs else 0, len(records)))
+                    records.tofile(spill)
+            rows_per_run = max(MIN_MERGE_ROWS, budget_rows // len(runs))
+            with open(spill_path, 'rb') as spill:
+                for records in _merge_runs(spill, runs, n_words + 1, rows_per_run):
+                    stats.add(records)
+    stats.close()
+
+    return ECBScanReport(block_size, n_blocks, stats.unique, stats.distances, stats.positions,
+                         stats.top_blocks)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print(__doc__)
+        sys.exit(1)
+
+    report = scan_file(sys.argv[1], int(sys.argv[2]) if len(sys.argv) == 3 else 16)
+
+    print_section_header("ECB PATTERN LEAKAGE SCAN")
+    print(f"Blocks:          {report.n_blocks} x {report.block_size} bytes")
+    print(f"Unique blocks:   {report.unique_blocks}")
+    print(f"Duplicate ratio: {report.duplicate_ratio:.4%}")
+    if report.duplicate_blocks:
+        print("\nRepeat distance (blocks):")
+        for k in np.flatnonzero(report.distance_histogram):
+            print(f"  [{2 ** k:>10}, {2 ** (k + 1):>10}): {report.distance_histogram[k]}")
+        print("\nMost repeated blocks:")
+        for count, block in report.top_blocks:
+            print(f"  {block.hex().upper()}  x{count}")
+    print("\nLikely ECB" if report.duplicate_ratio > 0.01 else "\nNo ECB pattern found")
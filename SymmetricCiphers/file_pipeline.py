@@ -0,0 +1,224 @@
+"""
+Memory-Mapped File Encryption Pipeline
+
+Encrypts or decrypts files of any size with the modes of block_modes.py while
+keeping memory use constant:
+
+    - the input is read in block-aligned windows, each memory-mapped on its
+      own and unmapped once processed, so only one window is resident
+    - stream modes (CFB, CFB<s>, OFB, CTR) write into a preallocated output
+      file, since the output has exactly the input size, mapping one output
+      window at a time
+    - ECB/CBC (whose padding changes the size) write through a buffered writer
+
+Each run reports bytes processed, throughput and the peak RSS of the process.
+
+Usage:
+    python file_pipeline.py encrypt|decrypt <mode> <key hex> <iv hex|-> <input> <output>
+
+    mode: ECB, CBC, CFB, OFB, CTR, CFB1, CFB8 or CFB64
+"""
+
+import mmap
+import os
+import sys
+import time
+
+from aes_batch import BatchAES
+from aes_engine import AES
+from block_modes import MODES, SEGMENT_MODES, create_mode, ModeContext
+from formatting_utils import print_section_header
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Default window size in bytes (rounded down to whole blocks)
+DEFAULT_WINDOW_SIZE = 8 * 1024 * 1024
+
+# Modes whose blocks are processed in bulk in the given direction (True =
+# encrypting); all other runs chain one block at a time
+BATCHED_MODES = {('ECB', True), ('ECB', False), ('CBC', False), ('CFB', False),
+                 ('CTR', True), ('CTR', False)}
+
+
+def peak_rss_bytes():
+    """
+    Peak resident set size of this process.
+
+    Returns:
+        int | None: Bytes, or None where the resource module is unavailable
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class PipelineStats:
+    """
+    Result of a file pipeline run.
+
+    Attributes:
+        bytes_in (int): Input size
+        bytes_out (int): Output size
+        seconds (float): Wall-clock duration
+        peak_rss (int | None): Peak resident set size of the process in bytes
+    """
+
+    def __init__(self, bytes_in, bytes_out, seconds, peak_rss):
+        self.bytes_in = bytes_in
+        self.bytes_out = bytes_out
+        self.seconds = seconds
+        self.peak_rss = peak_rss
+
+    @property
+    def throughput(self):
+        """Input bytes per second."""
+        return self.bytes_in / self.seconds if self.seconds else float('inf')
+
+    def __repr__(self):
+        rss = f"{self.peak_rss / 2**20:.1f} MiB" if self.peak_rss is not None else "n/a"
+        return (f"PipelineStats(in={self.bytes_in}, out={self.bytes_out}, "
+                f"{self.throughput / 2**20:.2f} MiB/s, peak RSS {rss})")
+
+
+def _window_size(window_size, block_size):
+    window = window_size - window_size % block_size
+    if window <= 0:
+        raise ValueError(f"Window size must be at least one block ({block_size} bytes)")
+    return window
+
+
+def _map(f, pos, length, access):
+    """Map length bytes of f from pos; returns (map, memoryview of those bytes)."""
+    # mmap offsets must be multiples of the allocation granularity
+    start = pos - pos % mmap.ALLOCATIONGRANULARITY
+    mapped = mmap.mmap(f.fileno(), pos - start + length, offset=start, access=access)
+    return mapped, memoryview(mapped)[pos - start:]
+
+
+def _windows(f, size, window):
+    """Yield memoryviews of f, window bytes at a time; each window is mapped only while in use."""
+    for pos in range(0, size, window):
+        mapped, part = _map(f, pos, min(window, size - pos), mmap.ACCESS_READ)
+        try:
+            yield part
+        finally:
+            part.release()
+            mapped.close()
+
+
+def _run(ctx, in_path, out_path, window_size):
+    window = _window_size(window_size, ctx.block_size)
+    start = time.perf_counter()
+    size = os.path.getsize(in_path)
+
+    with open(in_path, 'rb') as fin:
+        if ctx.mode.is_stream:
+            # Output size == input size: write straight into a preallocated
+            # file, mapping the matching output window next to each input one
+            with open(out_path, 'w+b') as fout:
+                fout.truncate(size)
+                pos = 0
+                for part in _windows(fin, size, window):
+                    out = ctx.update(part)
+                    if out:
+                        dst, view = _map(fout, pos, len(out), mmap.ACCESS_WRITE)
+                        try:
+                            view[:] = out
+                            dst.flush()
+                        finally:
+                            view.release()
+                            dst.close()
+                        pos += len(out)
+                ctx.finalize()
+            written = size
+        else:
+            written = 0
+            with open(out_path, 'wb', buffering=window) as fout:
+                for part in _windows(fin, size, window):
+                    written += fout.write(ctx.update(part))
+                written += fout.write(ctx.finalize())
+
+    return PipelineStats(size, written, time.perf_counter() - start, peak_rss_bytes())
+
+
+def encrypt_file(cipher, mode, in_path, out_path, iv=None, padding=True,
+                 window_size=DEFAULT_WINDOW_SIZE, workers=None):
+    """
+    Encrypt a file with a block cipher mode in constant memory.
+
+    Args:
+        cipher: Block cipher object (block_size, encrypt_block, decrypt_block)
+        mode (str): 'ECB', 'CBC', 'CFB', 'OFB', 'CTR' or a CFB segment mode ('CFB8', ...)
+        in_path (str): Plaintext file
+        out_path (str): Ciphertext file (overwritten)
+        iv (bytes, optional): IV / initial counter block
+        padding (bool | str): ECB/CBC padding as in block_modes.encryptor() (default: True)
+        window_size (int): Bytes read per window (default: 8 MiB)
+        workers (int, optional): Worker processes for bulk block operations
+
+    Returns:
+        PipelineStats: Sizes, throughput and peak RSS
+    """
+    ctx = ModeContext(create_mode(cipher, mode, iv, workers), True, padding)
+    return _run(ctx, in_path, out_path, window_size)
+
+
+def decrypt_file(cipher, mode, in_path, out_path, iv=None, padding=True,
+                 window_size=DEFAULT_WINDOW_SIZE, workers=None):
+    """
+    Decrypt a file with a block cipher mode in constant memory.
+
+    Arguments as in encrypt_file().
+
+    Returns:
+        PipelineStats: Sizes, throughput and peak RSS
+    """
+    ctx = ModeContext(create_mode(cipher, mode, iv, workers), False, padding)
+    return _run(ctx, in_path, out_path, window_size)
+
+
+def file_cipher(key, mode, encrypting):
+    """
+    The AES implementation that is fastest for a mode and direction.
+
+    BatchAES encrypts many blocks per NumPy call but is slow for a single
+    block; aes_engine.AES is fast per block. Chained runs (CBC/CFB
+    encryption, OFB, CFB segments) go one block at a time, so they get AES.
+
+    Args:
+        key (bytes): AES key
+        mode (str): Mode name as accepted by create_mode()
+        encrypting (bool): Direction of the run
+
+    Returns:
+        BatchAES | AES: Block cipher object
+    """
+    if (mode.upper(), encrypting) in BATCHED_MODES:
+        return BatchAES(key)
+    return AES(key)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 7 or sys.argv[1] not in ('encrypt', 'decrypt') \
+            or sys.argv[2].upper() not in MODES + SEGMENT_MODES:
+        print(__doc__)
+        sys.exit(1)
+
+    action, mode, key_hex, iv_hex, in_path, out_path = sys.argv[1:]
+    iv = None if iv_hex == '-' else bytes.fromhex(iv_hex)
+    encrypting = action == 'encrypt'
+    run = encrypt_file if encrypting else decrypt_file
+    stats = run(file_cipher(bytes.fromhex(key_hex), mode, encrypting), mode, in_path, out_path, iv)
+
+    print_section_header(f"AES-{mode.upper()} FILE {action.upper()}")
+    print(f"Input:      {in_path} ({stats.bytes_in} bytes)")
+    print(f"Output:     {out_path} ({stats.bytes_out} bytes)")
+    print(f"Time:       {stats.seconds:.3f} s")
+    print(f"Throughput: {stats.throughput / 2**20:.2f} MiB/s")
+    if stats.peak_rss is not None:
+        print(f"Peak RSS:   {stats.peak_rss / 2**20:.1f} MiB")
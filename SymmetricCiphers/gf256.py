@@ -0,0 +1,147 @@
+"""
+GF(2^8) Arithmetic Tables
+
+This module builds the exponential (antilog) and logarithm tables of GF(2^8)
+for a given irreducible polynomial. Every non-zero element of the field is a
+power of a generator g, so a multiplication turns into an addition of logs:
+
+    a * b = exp[log[a] + log[b]]        (a, b != 0)
+    a^-1  = exp[255 - log[a]]           (a != 0)
+
+The tables are computed once per polynomial and memoized, with no printing,
+so they can be used as the fast path behind the educational functions in
+Euclidean_GF_algorithm.py and AES-algorithm.py.
+"""
+
+from functools import lru_cache
+
+# AES irreducible polynomial m(x) = x^8 + x^4 + x^3 + x + 1
+AES_MODULUS = 0x11B
+
+# 3 = x + 1 is the generator used by AES for m(x) = 0x11B
+AES_GENERATOR = 0x03
+
+
+def poly_mul(a, b, poly=AES_MODULUS):
+    """
+    Multiply two bytes in GF(2^8) with the shift-and-add method.
+
+    Only used to build the tables; use the tables for bulk work.
+
+    Args:
+        a (int): First factor (0-255)
+        b (int): Second factor (0-255)
+        poly (int): Irreducible polynomial of degree 8 (default: 0x11B)
+
+    Returns:
+        int: a * b mod poly
+
+    Example:
+        >>> hex(poly_mul(0x57, 0x83))
+        '0xc1'
+    """
+    p = 0
+    while b:
+        if b & 1:
+            p ^= a
+        a <<= 1
+        if a & 0x100:
+            a ^= poly
+        b >>= 1
+    return p
+
+
+def _power_cycle(g, poly):
+    """Return [g^0, g^1, ..., g^254] or None if g does not have order 255."""
+    powers = [1]
+    x = 1
+    for _ in range(254):
+        x = poly_mul(x, g, poly)
+        if x == 1:
+            return None
+        powers.append(x)
+    if poly_mul(x, g, poly) != 1:
+        return None
+    return powers
+
+
+@lru_cache(maxsize=None)
+def exp_log_tables(poly=AES_MODULUS):
+    """
+    Build the antilog (exp) and log tables of GF(2^8) for a polynomial.
+
+    The generator 3 is tried first (the AES choice); if it is not primitive
+    for the given polynomial the smallest generator is used instead.
+
+    Args:
+        poly (int): Irreducible polynomial of degree 8 (default: 0x11B)
+
+    Returns:
+        tuple: (generator, exp, log) where exp is a tuple of 510 entries
+               (doubled so exp[log[a] + log[b]] needs no "mod 255") and
+               log is a tuple of 256 entries (log[0] is unused and set to 0)
+
+    Raises:
+        ValueError: If poly is not an irreducible polynomial of degree 8
+    """
+    if poly >> 8 != 1:
+        raise ValueError(f"Polynomial 0x{poly:X} is not of degree 8")
+
+    for g in (AES_GENERATOR, *range(2, 256)):
+        powers = _power_cycle(g, poly)
+        if powers is not None:
+            break
+    else:
+        # No element of order 255 -> the quotient ring is not a field
+        raise ValueError(f"Polynomial 0x{poly:X} is not irreducible")
+
+    log = [0] * 256
+    for i, x in enumerate(powers):
+        log[x] = i
+    return g, tuple(powers + powers), tuple(log)
+
+
+@lru_cache(maxsize=None)
+def inverse_table(poly=AES_MODULUS):
+    """
+    Multiplicative inverses of all bytes in GF(2^8).
+
+    Args:
+        poly (int): Irreducible polynomial of degree 8 (default: 0x11B)
+
+    Returns:
+        bytes: 256 entries where inv[a] * a = 1 (inv[0] = 0 by convention)
+
+    Example:
+        >>> hex(inverse_table()[0x53])
+        '0xca'
+    """
+    _, exp, log = exp_log_tables(poly)
+    inv = bytearray(256)
+    for a in range(1, 256):
+        inv[a] = exp[255 - log[a]]
+    return bytes(inv)
+
+
+@lru_cache(maxsize=None)
+def multiplication_table(poly=AES_MODULUS):
+    """
+    Full 256 x 256 multiplication table of GF(2^8) (64 KiB).
+
+    Args:
+        poly (int): Irreducible polynomial of degree 8 (default: 0x11B)
+
+    Returns:
+        bytes: 65536 entries, table[(a << 8) | b] = a * b
+
+    Example:
+        >>> hex(multiplication_table()[(0x57 << 8) | 0x83])
+        '0xc1'
+    """
+    _, exp, log = exp_log_tables(poly)
+    table = bytearray(65536)
+    for a in range(1, 256):
+        log_a = log[a]
+        # Row a: a * b = exp[log(a) + log(b)], column 0 stays 0
+        table[(a << 8) + 1:(a << 8) + 256] = bytes(exp[log_a + log[b]] for b in range(1, 256))
+    return bytes(table)
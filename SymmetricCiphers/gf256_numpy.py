@@ -0,0 +1,159 @@
+"""
+Vectorized GF(2^8) Arithmetic with NumPy
+
+Wraps the tables of gf256.py (multiplication, exp/log and inverse tables)
+as NumPy uint8 arrays so whole arrays of field elements are multiplied,
+inverted or raised to a power with a single fancy-index instead of the
+8-iteration shift-and-add loop of gf_mult / gf_mul.
+
+    >>> F = get_field()                       # AES field, m(x) = 0x11B
+    >>> F.mul(np.array([0x57], np.uint8), 0x83)
+    array([193], dtype=uint8)
+
+All functions accept scalars or arrays of any shape (broadcasting like
+NumPy) and return uint8 arrays.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from gf256 import AES_MODULUS, exp_log_tables, inverse_table, multiplication_table
+
+
+class GF256:
+    """
+    GF(2^8) defined by a reduction polynomial, backed by precomputed tables.
+
+    Attributes:
+        poly (int): Reduction polynomial
+        generator (int): Generator used for the exp/log tables
+        mul_table (np.ndarray): (256, 256) uint8, mul_table[a, b] = a * b
+        exp_table (np.ndarray): (510,) uint8, exp_table[i] = g^(i mod 255)
+        log_table (np.ndarray): (256,) int32, log_table[a] = log_g(a), log_table[0] = 0
+        inv_table (np.ndarray): (256,) uint8, inv_table[a] = a^-1, inv_table[0] = 0
+    """
+
+    def __init__(self, poly=AES_MODULUS):
+        generator, exp, log = exp_log_tables(poly)
+        self.poly = poly
+        self.generator = generator
+        self.mul_table = np.frombuffer(multiplication_table(poly), dtype=np.uint8).reshape(256, 256)
+        self.exp_table = np.array(exp, dtype=np.uint8)
+        self.log_table = np.array(log, dtype=np.int32)
+        self.inv_table = np.frombuffer(inverse_table(poly), dtype=np.uint8)
+
+    def __repr__(self):
+        return f"GF256(poly=0x{self.poly:X})"
+
+    def mul(self, a, b):
+        """
+        Element-wise product a * b.
+
+        Args:
+            a (array_like): Field elements (0-255)
+            b (array_like): Field elements (0-255), broadcast against a
+
+        Returns:
+            np.ndarray: uint8 array of products
+        """
+        return self.mul_table[np.asarray(a, dtype=np.uint8), np.asarray(b, dtype=np.uint8)]
+
+    def inv(self, a):
+        """
+        Element-wise multiplicative inverse a^-1.
+
+        Args:
+            a (array_like): Non-zero field elements
+
+        Returns:
+            np.ndarray: uint8 array of inverses
+
+        Raises:
+            ZeroDivisionError: If any element is 0
+        """
+        a = np.asarray(a, dtype=np.uint8)
+        if np.any(a == 0):
+            raise ZeroDivisionError("0 has no multiplicative inverse in GF(2^8)")
+        return self.inv_table[a]
+
+    def pow(self, a, n):
+        """
+        Element-wise power a^n (n may be negative for non-zero a).
+
+        Args:
+            a (array_like): Field elements (0-255)
+            n (array_like): Integer exponents, broadcast against a
+
+        Returns:
+            np.ndarray: uint8 array of powers (0^0 = 1, 0^n = 0 for n > 0)
+
+        Raises:
+            ZeroDivisionError: If 0 is raised to a negative power
+        """
+        a = np.asarray(a, dtype=np.uint8)
+        n = np.asarray(n, dtype=np.int64)
+        zero = a == 0
+        if np.any(zero & (n < 0)):
+            raise ZeroDivisionError("0 cannot be raised to a negative power")
+        # g^(log(a) * n), reduced mod 255 (the order of the multiplicative group)
+        result = self.exp_table[(self.log_table[a] * n) % 255]
+        return np.where(zero, (n == 0).astype(np.uint8), result)
+
+    def dot(self, a, b):
+        """
+        Matrix product over GF(2^8): additions are XOR, products use mul_table.
+
+        Follows np.dot shapes for 1-D and 2-D operands: a is (k,) or (m, k),
+        b is (k,) or (k, n).
+
+        Args:
+            a (array_like): Left operand
+            b (array_like): Right operand
+
+        Returns:
+            np.ndarray: uint8 result of shape (), (m,), (n,) or (m, n)
+        """
+        a = np.asarray(a, dtype=np.uint8)
+        b = np.asarray(b, dtype=np.uint8)
+        if a.shape[-1] != b.shape[0]:
+            raise ValueError(f"shapes {a.shape} and {b.shape} not aligned")
+        b_2d = b.reshape(b.shape[0], -1)
+        # (..., k, 1) x (k, n) -> (..., k, n), then XOR-reduce over k
+        products = self.mul_table[a[..., :, None], b_2d]
+        result = np.bitwise_xor.reduce(products, axis=-2)
+        return result.reshape(a.shape[:-1] + b.shape[1:])
+
+
+@lru_cache(maxsize=None)
+def get_field(poly=AES_MODULUS):
+    """
+    Return the (cached) GF256 instance for a reduction polynomial.
+
+    Args:
+        poly (int): Irreducible polynomial of degree 8 (default: 0x11B)
+
+    Returns:
+        GF256: Field with its tables built
+    """
+    return GF256(poly)
+
+
+def mul(a, b, poly=AES_MODULUS):
+    """Element-wise a * b in GF(2^8) (see GF256.mul)."""
+    return get_field(poly).mul(a, b)
+
+
+def inv(a, poly=AES_MODULUS):
+    """Element-wise a^-1 in GF(2^8) (see GF256.inv)."""
+    return get_field(poly).inv(a)
+
+
+def pow(a, n, poly=AES_MODULUS):
+    """Element-wise a^n in GF(2^8) (see GF256.pow)."""
+    return get_field(poly).pow(a, n)
+
+
+def dot(a, b, poly=AES_MODULUS):
+    """Matrix product over GF(2^8) (see GF256.dot)."""
+    return get_field(poly).dot(a, b)
@@ -0,0 +1,318 @@
+"""
+LFSR Toolkit: Bit-Packed Stepping, Jump-Ahead and Berlekamp-Massey
+
+A linear feedback shift register of length L produces bits s_0, s_1, ...
+with the recurrence given by its connection polynomial
+C(x) = 1 + c_1 x + ... + c_L x^L:
+
+    s_n = c_1 s_(n-1) XOR c_2 s_(n-2) XOR ... XOR c_L s_(n-L)
+
+Everything here works on Python ints used as bit vectors over GF(2):
+
+    - the state is one int (bit k = s_(t+k)), a step is a shift plus the
+      parity (int.bit_count() & 1) of state AND feedback mask
+    - the step matrix M is a list of row masks; the rows of M^64 and of the
+      first 64 output bits are precomputed, so 64 output bits cost 64
+      parities and no per-bit shifting
+    - powers M^(2^k) are cached, so jump(n) costs about log2(n) matrix-vector
+      products instead of n steps
+    - Berlekamp-Massey keeps C(x), B(x) and the reversed recent bits as ints,
+      so every discrepancy is one AND and one bit_count over ~L bits
+
+Sequences are passed around as (int, length) with bit i = s_i, which is
+what np.packbits(bits, bitorder='little') + int.from_bytes(..., 'little')
+produce (see pack_bits).
+"""
+
+import numpy as np
+
+from formatting_utils import print_section_header
+
+# Bits produced per packed step
+WORD_BITS = 64
+WORD_MASK = (1 << WORD_BITS) - 1
+
+
+def pack_bits(bits):
+    """
+    Pack a sequence of 0/1 values into an int, bit i = bits[i].
+
+    Returns:
+        tuple: (int, number of bits)
+    """
+    bits = np.asarray(bits, dtype=np.uint8)
+    return int.from_bytes(np.packbits(bits, bitorder='little').tobytes(), 'little'), len(bits)
+
+
+def unpack_bits(value, n):
+    """Inverse of pack_bits: (n,) uint8 array of the bits of value."""
+    raw = np.frombuffer(value.to_bytes(-(-n // 8), 'little'), dtype=np.uint8)
+    return np.unpackbits(raw, bitorder='little')[:n]
+
+
+def poly_from_taps(taps):
+    """
+    Connection polynomial from its exponents, e.g. [16, 14, 13, 11] -> x^16 + x^14 + x^13 + x^11 + 1.
+
+    Returns:
+        int: Polynomial with bit i = coefficient of x^i (the constant 1 is added)
+    """
+    poly = 1
+    for t in taps:
+        poly |= 1 << t
+    return poly
+
+
+def _parity(x):
+    return x.bit_count() & 1
+
+
+def _join_words(words):
+    """Concatenate 64-bit words (first word = lowest bits) without quadratic shifting."""
+    return int.from_bytes(b''.join(w.to_bytes(8, 'little') for w in words), 'little')
+
+
+def mat_vec(rows, v):
+    """Apply a GF(2) matrix (list of row masks) to a bit vector."""
+    out = 0
+    for k, row in enumerate(rows):
+        if (row & v).bit_count() & 1:
+            out |= 1 << k
+    return out
+
+
+def mat_mul(a, b):
+    """GF(2) matrix product a * b (apply b first, then a), rows as masks."""
+    out = []
+    for row in a:
+        acc = 0
+        k = 0
+        while row:
+            if row & 1:
+                acc ^= b[k]
+            row >>= 1
+            k += 1
+        out.append(acc)
+    return out
+
+
+class LFSR:
+    """
+    Fibonacci LFSR with packed 64-bit output and jump-ahead.
+
+    Args:
+        poly (int): Connection polynomial, bit i = c_i (bit 0 must be 1), degree L
+        state (int): Initial bits s_0 .. s_(L-1) (bit i = s_i), not all zero
+
+    Example:
+        >>> r = LFSR(poly_from_taps([4, 3]), 0b0001)
+        >>> [r.step() for _ in range(8)]
+        [1, 0, 0, 0, 1, 0, 0, 1]
+    """
+
+    def __init__(self, poly, state):
+        if not poly & 1:
+            raise ValueError("Connection polynomial must have constant term 1")
+        self.poly = poly
+        self.length = L = poly.bit_length() - 1
+        if L < 1:
+            raise ValueError("Connection polynomial must have degree at least 1")
+        self.state = state & ((1 << L) - 1)
+        # New bit s_(t+L) = XOR of c_i s_(t+L-i): bit L-i of the window
+        self.feedback = sum(1 << (L - i) for i in range(1, L + 1) if (poly >> i) & 1)
+
+        # Step matrix and the precomputed rows for one 64-bit word
+        step = [1 << (k + 1) for k in range(L - 1)] + [self.feedback]
+        self._powers = [step]                      # M^(2^k), extended by jump()
+        power = [1 << k for k in range(L)]         # M^0
+        out_rows = []
+        for m in range(WORD_BITS):
+            out_rows.append(power[0])              # s_(t+m) = bit 0 after m steps
+            power = mat_mul(step, power)
+        self._word_out = out_rows[min(L, WORD_BITS):]
+        self._word_low = (1 << min(L, WORD_BITS)) - 1
+        self._word_next = power[max(0, L - WORD_BITS):]   # rows of M^64 not given by the shift
+        self._word_shift_from = max(0, L - WORD_BITS)
+
+    def step(self):
+        """Output one bit and advance the register by one step."""
+        s = self.state
+        self.state = (s >> 1) | (_parity(s & self.feedback) << (self.length - 1))
+        return s & 1
+
+    def next_word(self):
+        """
+        Output the next 64 bits at once.
+
+        Returns:
+            int: Bit m = output bit m of this block
+        """
+        s = self.state
+        out = s & self._word_low
+        for m, row in enumerate(self._word_out, min(self.length, WORD_BITS)):
+            if (s & row).bit_count() & 1:
+                out |= 1 << m
+        new = s >> WORD_BITS
+        for k, row in enumerate(self._word_next, self._word_shift_from):
+            if (s & row).bit_count() & 1:
+                new |= 1 << k
+        self.state = new
+        return out
+
+    def bits(self, n):
+        """
+        Output the next n bits.
+
+        Returns:
+            int: Bit i = i-th output bit
+        """
+        words = -(-n // WORD_BITS)
+        out = _join_words(self.next_word() for _ in range(words))
+        extra = WORD_BITS * words - n
+        if extra:
+            # Back up over the bits of the last word that were not requested
+            out &= (1 << n) - 1
+            self._rewind(extra)
+        return out
+
+    def _rewind(self, n):
+        """Undo the last n steps (the step map is invertible since c_L = 1)."""
+        L = self.length
+        for _ in range(n):
+            s = self.state
+            top = s >> (L - 1)
+            # s_(t-1) is the bit that makes the feedback parity of the previous window match
+            prev_rest = (s << 1) & ((1 << L) - 1)
+            first = top ^ _parity(prev_rest & self.feedback)
+            self.state = prev_rest | first
+
+    def jump(self, n):
+        """Advance by n steps without producing output (cached M^(2^k) powers)."""
+        k = 0
+        while n:
+            while len(self._powers) <= k:
+                last = self._powers[-1]
+                self._powers.append(mat_mul(last, last))
+            if n & 1:
+                self.state = mat_vec(self._powers[k], self.state)
+            n >>= 1
+            k += 1
+
+
+def geffe(x1, x2, x3):
+    """Geffe combiner on packed words: x1 ? x2 : x3."""
+    return (x1 & x2) ^ (~x1 & WORD_MASK & x3)
+
+
+def majority(x1, x2, x3):
+    """Majority combiner on packed words."""
+    return (x1 & x2) ^ (x1 & x3) ^ (x2 & x3)
+
+
+class CombinationGenerator:
+    """
+    Several LFSRs whose outputs are combined by a Boolean function, 64 bits at a time.
+
+    Args:
+        registers (list): LFSR objects
+        combine (callable): Function of one packed word per register (e.g. geffe)
+    """
+
+    def __init__(self, registers, combine):
+        self.registers = registers
+        self.combine = combine
+
+    def next_word(self):
+        return self.combine(*(r.next_word() for r in self.registers))
+
+    def bits(self, n):
+        """Next n output bits as an int (whole words are generated, the rest dropped)."""
+        words = -(-n // WORD_BITS)
+        return _join_words(self.next_word() for _ in range(words)) & ((1 << n) - 1)
+
+
+def berlekamp_massey(sequence, n):
+    """
+    Shortest LFSR that generates a binary sequence (Berlekamp-Massey over GF(2)).
+
+    Args:
+        sequence (int): Bits, bit i = s_i
+        n (int): Number of bits
+
+    Returns:
+        tuple: (linear complexity L, connection polynomial C as int, bit i = c_i)
+    """
+    sequence &= (1 << n) - 1
+    # Whole sequence bit-reversed (bit n-1-i = s_i), to refill the window when L grows
+    reversed_seq = int(format(sequence, f'0{n}b')[::-1], 2) if n else 0
+    C, B = 1, 1
+    L, m = 0, 1
+    window = 64                    # bits kept in `recent`, always > L
+    recent = 0                     # bit i = s_(k-i)
+    for k in range(n):
+        if not k % WORD_BITS:
+            chunk = (sequence >> k) & WORD_MASK
+        recent = ((recent << 1) | ((chunk >> (k % WORD_BITS)) & 1)) & ((1 << window) - 1)
+        # d = s_k + sum c_i s_(k-i)
+        if (C & recent).bit_count() & 1:
+            T = C
+            C ^= B << m
+            if 2 * L <= k:
+                L = k + 1 - L
+                B = T
+                m = 1
+                if L >= window:
+                    window = 2 * (L + 1)
+                    recent = (reversed_seq >> (n - 1 - k)) & ((1 << window) - 1)
+                continue
+        m += 1
+    return L, C
+
+
+def linear_complexity(sequence, n):
+    """Linear complexity of the first n bits (see berlekamp_massey)."""
+    return berlekamp_massey(sequence, n)[0]
+
+
+def lfsr_from_sequence(sequence, n):
+    """
+    Rebuild a register that continues a sequence.
+
+    Returns:
+        LFSR: Register in the state after its first L output bits were s_0 .. s_(L-1)
+    """
+    L, C = berlekamp_massey(sequence, n)
+    # deg C < L means c_L = 0: the first bits are not generated by the recurrence
+    if C.bit_length() - 1 != L:
+        raise ValueError("Sequence needs a singular LFSR (c_L = 0), not supported")
+    return LFSR(C, sequence & ((1 << L) - 1))
+
+
+if __name__ == "__main__":
+    import time
+
+    print_section_header("LFSR TOOLKIT")
+    poly = poly_from_taps([127, 1])            # x^127 + x + 1, primitive
+    reg = LFSR(poly, 0x1234567)
+    n = 200_000
+    start = time.perf_counter()
+    seq = reg.bits(n)
+    print(f"Generated {n} bits of a length-127 LFSR in {time.perf_counter() - start:.3f} s")
+
+    start = time.perf_counter()
+    L, C = berlekamp_massey(seq, n)
+    print(f"Berlekamp-Massey: L = {L}, C(x) taps {[i for i in range(C.bit_length()) if C >> i & 1]}"
+          f" in {time.perf_counter() - start:.3f} s")
+
+    jumped = LFSR(poly, 0x1234567)
+    jumped.jump(10 ** 6)
+    stepped = LFSR(poly, 0x1234567)
+    stepped.bits(10 ** 6)
+    print(f"jump(10^6) matches stepping: {jumped.state == stepped.state}")
+
+    geffe_gen = CombinationGenerator([LFSR(poly_from_taps([31, 3]), 1), LFSR(poly_from_taps([29, 2]), 1),
+                                      LFSR(poly_from_taps([23, 5]), 1)], geffe)
+    out = geffe_gen.bits(20_000)
+    # x1 x2 + x1 x3 + x3: complexity L1 L2 + L1 L3 + L3
+    print(f"Geffe generator (31, 29, 23): linear complexity {linear_complexity(out, 20_000)}"
+          f" (expected 31*29 + 31*23 + 23 = {31 * 29 + 31 * 23 + 23})")
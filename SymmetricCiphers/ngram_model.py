@@ -0,0 +1,317 @@
+"""
+N-Gram Language Model for Classical Cryptanalysis
+
+The solvers of the substitution and Vigenère ciphers all ask the same
+question over and over: how English does this candidate plaintext look?
+english_letter_frequency (Substitution-ciphers.py) answers it only for
+single letters. This model holds log10 probabilities of 1- to 4-grams:
+
+    - letters are codes A=0 .. Z=25, and an n-gram is the base-26 number of
+      its letters ('THE' = (19 * 26 + 7) * 26 + 4), so the table of order n
+      is a flat float32 array of 26^n entries and a lookup is an index
+    - the windows of a text are scored at once: sliding_window_view turns
+      the (L,) codes into (L - n + 1, n) windows, one matrix product with
+      (26^(n-1), ..., 26, 1) gives all indexes, one fancy index all scores;
+      a (M, L) batch of candidates works the same way along the last axis
+    - building from a corpus takes a moment, so the tables are saved in one
+      binary file (small header + the raw float32 tables) and later opened
+      with np.memmap: startup only maps the file, pages load on first use
+
+The corpus is any set of local text files; by default the one file
+corpus/newton_opticks.txt (Newton's Opticks, 4th edition 1730, a public
+domain text of about 550 KB), so the model and its cache only change when
+that file does. corpus/heldout_sample.txt is kept out of training for the
+solvers' self-tests. Counts are smoothed towards independent letters so
+that n-grams missing from a small corpus still rank by how common their
+letters are.
+"""
+
+import glob
+import hashlib
+import os
+import struct
+from functools import lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from formatting_utils import print_section_header
+
+MAX_ORDER = 4
+
+# Weight of the independent-letters model mixed into the n-gram counts
+SMOOTHING = 0.05
+
+# Directory of the bundled text files
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+
+# Default training corpus
+DEFAULT_CORPUS = os.path.join(CORPUS_DIR, 'newton_opticks.txt')
+
+# English text that is not part of DEFAULT_CORPUS, for testing the solvers
+HELDOUT_SAMPLE = os.path.join(CORPUS_DIR, 'heldout_sample.txt')
+
+# Cache file of the default model (override with NGRAM_CACHE; otherwise under
+# XDG_CACHE_HOME, or ~/.cache when it is not set)
+DEFAULT_CACHE = os.environ.get('NGRAM_CACHE') or os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'cibersecurity_notes', 'english_ngrams.bin')
+
+# Cache file layout: magic, version, max order, corpus signature, padded to
+# HEADER_SIZE bytes so the float32 tables start aligned
+MAGIC = b'NGRM'
+VERSION = 1
+HEADER = struct.Struct('<4sII32s')
+HEADER_SIZE = 64
+
+
+def letters_to_codes(text):
+    """
+    Letters of a text as codes 0..25, everything else dropped.
+
+    Args:
+        text (str | bytes): Text (non-ASCII characters are ignored)
+
+    Returns:
+        np.ndarray: (n,) uint8
+    """
+    if isinstance(text, str):
+        text = text.encode('ascii', 'ignore')
+    raw = np.frombuffer(bytes(text), dtype=np.uint8) & 0xDF     # a..z -> A..Z
+    return raw[(raw >= 65) & (raw <= 90)] - 65
+
+
+def ngram_code(ngram):
+    """Index of an n-gram string in the table of its order ('THE' -> 12848)."""
+    code = 0
+    for c in ngram.upper():
+        code = code * 26 + ord(c) - 65
+    return code
+
+
+def window_codes(codes, n):
+    """
+    Base-26 index of every n-letter window.
+
+    Args:
+        codes (np.ndarray): (L,) or (M, L) letter codes
+        n (int): Window length
+
+    Returns:
+        np.ndarray: (L - n + 1,) or (M, L - n + 1) int64
+    """
+    powers = 26 ** np.arange(n - 1, -1, -1, dtype=np.int64)
+    windows = sliding_window_view(np.asarray(codes), n, axis=-1)
+    return windows.astype(np.int64) @ powers
+
+
+def corpus_paths(corpus=None):
+    """Sorted files of a corpus given as a path or glob, or a list of them."""
+    corpus = corpus or DEFAULT_CORPUS
+    patterns = [corpus] if isinstance(corpus, str) else corpus
+    paths = sorted({os.path.abspath(p) for pattern in patterns for p in glob.glob(pattern, recursive=True)})
+    if not paths:
+        raise FileNotFoundError(f"No corpus file matches {patterns}")
+    return paths
+
+
+def _signature(paths, max_order):
+    """Hash of the corpus files (path, size, mtime) and model parameters."""
+    h = hashlib.blake2b(digest_size=32)
+    h.update(f"{VERSION}:{max_order}:{SMOOTHING}".encode())
+    for path in paths:
+        st = os.stat(path)
+        h.update(f"{path}:{st.st_size}:{st.st_mtime_ns}\n".encode())
+    return h.digest()
+
+
+class NGramModel:
+    """
+    log10 n-gram probabilities of orders 1 .. max_order.
+
+    Attributes:
+        tables (dict): order -> (26^order,) float32 array, indexed by base-26 code
+        max_order (int): Highest order available
+
+    Example:
+        >>> model = english_model(cache_path=None)
+        >>> model.score("the quick brown fox") > model.score("xqz jvvkq wrtpm zzq")
+        True
+    """
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.max_order = max(tables)
+
+    @classmethod
+    def build(cls, corpus=None, max_order=MAX_ORDER):
+        """
+        Count the n-grams of a corpus.
+
+        Args:
+            corpus (str | list, optional): Text file paths or globs (default: DEFAULT_CORPUS)
+            max_order (int): Longest n-gram (default: 4, table of 26^4 entries)
+
+        Returns:
+            NGramModel: Model with tables of orders 1 .. max_order
+        """
+        counts = {n: np.zeros(26 ** n, dtype=np.int64) for n in range(1, max_order + 1)}
+        for path in corpus_paths(corpus):
+            with open(path, 'rb') as f:
+                codes = letters_to_codes(f.read())
+            for n in counts:
+                if len(codes) >= n:
+                    counts[n] += np.bincount(window_codes(codes, n), minlength=26 ** n)
+
+        unigram = (counts[1] + 1) / (counts[1].sum() + 26)
+        tables = {1: np.log10(unigram).astype(np.float32)}
+        independent = unigram
+        for n in range(2, max_order + 1):
+            independent = np.multiply.outer(independent, unigram).ravel()
+            total = max(int(counts[n].sum()), 1)
+            probabilities = (counts[n] + SMOOTHING * total * independent) / (total * (1 + SMOOTHING))
+            tables[n] = np.log10(probabilities).astype(np.float32)
+        return cls(tables)
+
+    def save(self, path, signature=bytes(32)):
+        """Write the model as header + raw float32 tables (orders ascending)."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.max_order, signature).ljust(HEADER_SIZE, b'\0'))
+            for n in range(1, self.max_order + 1):
+                f.write(self.tables[n].astype('<f4').tobytes())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, signature=None):
+        """
+        Map a saved model without reading it (np.memmap, read-only).
+
+        Args:
+            path (str): File written by save()
+            signature (bytes, optional): Expected corpus signature; mismatch raises ValueError
+
+        Returns:
+            NGramModel: Model whose tables are views of the mapped file
+        """
+        data = np.memmap(path, dtype=np.uint8, mode='r')
+        magic, version, max_order, stored = HEADER.unpack_from(data[:HEADER.size].tobytes())
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not an n-gram model of version {VERSION}")
+        if signature is not None and stored != signature:
+            raise ValueError(f"{path} was built from a different corpus")
+        tables = {}
+        offset = HEADER_SIZE
+        for n in range(1, max_order + 1):
+            size = 4 * 26 ** n
+            if offset + size > len(data):
+                raise ValueError(f"{path} is truncated")
+            tables[n] = data[offset:offset + size].view('<f4')
+            offset += size
+        return cls(tables)
+
+    def window_scores(self, text, n=None):
+        """
+        log10 probability of every n-letter window.
+
+        Args:
+            text (str | bytes | np.ndarray): Text, or (L,) / (M, L) letter codes
+            n (int, optional): Order (default: max_order)
+
+        Returns:
+            np.ndarray: (L - n + 1,) or (M, L - n + 1) float32
+        """
+        n = n or self.max_order
+        codes = text if isinstance(text, np.ndarray) else letters_to_codes(text)
+        if codes.shape[-1] < n:
+            return np.zeros(codes.shape[:-1] + (0,), dtype=np.float32)
+        return self.tables[n][window_codes(codes, n)]
+
+    def score(self, text, n=None):
+        """
+        Total log10 probability of a text (higher = more English).
+
+        Args:
+            text (str | bytes | np.ndarray): Text, or (L,) / (M, L) letter codes
+            n (int, optional): Order (default: max_order)
+
+        Returns:
+            float | np.ndarray: Score, one per row for (M, L) codes
+        """
+        total = self.window_scores(text, n).sum(axis=-1, dtype=np.float64)
+        return float(total) if np.ndim(total) == 0 else total
+
+    def score_per_window(self, text, n=None):
+        """Average log10 probability per window, comparable across lengths."""
+        windows = self.window_scores(text, n)
+        return windows.mean(axis=-1, dtype=np.float64) if windows.shape[-1] else float('-inf')
+
+
+def english_model(corpus=None, cache_path=DEFAULT_CACHE, max_order=MAX_ORDER):
+    """
+    The model of a corpus, from its cache file if it is up to date.
+
+    Builds and saves the model when the cache is missing, unreadable or was
+    built from other files; later calls (and other processes) only map it.
+    Models are cached per (corpus, cache_path, max_order) in this process.
+
+    Args:
+        corpus (str | list | tuple, optional): Text file paths or globs (default: DEFAULT_CORPUS)
+        cache_path (str, optional): Cache file (default: DEFAULT_CACHE, None = no cache)
+        max_order (int): Longest n-gram (default: 4)
+
+    Returns:
+        NGramModel: Memory-mapped model
+    """
+    if corpus is not None and not isinstance(corpus, str):
+        corpus = tuple(corpus)
+    return _english_model(corpus, cache_path, max_order)
+
+
+@lru_cache(maxsize=8)
+def _english_model(corpus, cache_path, max_order):
+    if cache_path is None:
+        return NGramModel.build(corpus, max_order)
+    signature = _signature(corpus_paths(corpus), max_order)
+    try:
+        return NGramModel.load(cache_path, signature)
+    except (OSError, ValueError, struct.error):
+        pass
+    model = NGramModel.build(corpus, max_order)
+    try:
+        model.save(cache_path, signature)
+    except OSError:
+        return model
+    return NGramModel.load(cache_path, signature)
+
+
+# Drop the models held by english_model (e.g. after the corpus changed)
+english_model.cache_clear = _english_model.cache_clear
+
+
+if __name__ == "__main__":
+    import time
+
+    print_section_header("N-GRAM LANGUAGE MODEL")
+    start = time.perf_counter()
+    model = NGramModel.build()
+    print(f"Built orders 1-{model.max_order} from {os.path.basename(DEFAULT_CORPUS)} "
+          f"in {time.perf_counter() - start:.2f} s")
+
+    english_model.cache_clear()
+    english_model()
+    start = time.perf_counter()
+    english_model.cache_clear()
+    cached = english_model()
+    print(f"Mapped cache {DEFAULT_CACHE} in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for text in ("meet me after the toga party", "phhw ph diwhu wkh wrjd sduwb"):
+        scores = [f"{cached.score_per_window(text, n):6.2f}" for n in range(1, cached.max_order + 1)]
+        print(f"  {text:30} per-window log10 P (1-4 grams): {' '.join(scores)}")
+
+    rng = np.random.default_rng(0)
+    batch = rng.integers(0, 26, size=(10000, 200), dtype=np.uint8)
+    start = time.perf_counter()
+    cached.score(batch)
+    print(f"Scored 10000 x 200-letter candidates in {time.perf_counter() - start:.3f} s")
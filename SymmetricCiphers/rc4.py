@@ -0,0 +1,126 @@
+"""
+RC4 Stream Cipher (silent version)
+
+The same KSA and PRGA as Stream-cipher.py, without any printing, for real
+data. The state is a 256-byte bytearray plus the two indices i and j, and
+the PRGA loop works on local variables only. Three ways to use it:
+
+    keystream(n)      next n keystream bytes
+    xor_into(buf)     encrypt/decrypt a writable buffer in place
+    iter_keystream()  generator of keystream bytes that shares the state,
+                      so it can be mixed with the other calls and resumed
+
+The keystream is XORed with the data as two big integers instead of byte
+by byte. update(data) -> bytes is the transform interface used by
+async_streams.py.
+"""
+
+
+def ksa(key):
+    """
+    RC4 key scheduling algorithm.
+
+    Args:
+        key (bytes): 1 to 256 byte key
+
+    Returns:
+        bytearray: Initial permutation S of 0..255
+    """
+    if not 1 <= len(key) <= 256:
+        raise ValueError("Key must be 1 to 256 bytes long")
+    S = bytearray(range(256))
+    key_len = len(key)
+    j = 0
+    for i in range(256):
+        si = S[i]
+        j = (j + si + key[i % key_len]) & 255
+        S[i] = S[j]
+        S[j] = si
+    return S
+
+
+class RC4:
+    """
+    RC4 keystream generator; encryption and decryption are the same operation.
+
+    Args:
+        key (bytes): 1 to 256 byte key
+        drop (int): Keystream bytes to discard first (RC4-drop[n], default: 0)
+
+    Example:
+        >>> RC4(b"Key").update(b"Plaintext").hex().upper()
+        'BBF316E8D940AF0AD3'
+    """
+
+    def __init__(self, key, drop=0):
+        self.S = ksa(key)
+        self.i = 0
+        self.j = 0
+        if drop:
+            self.keystream(drop)
+
+    def keystream(self, n):
+        """
+        Generate the next n keystream bytes (PRGA).
+
+        Returns:
+            bytes: Keystream
+        """
+        S = self.S
+        i, j = self.i, self.j
+        out = bytearray(n)
+        for k in range(n):
+            i = (i + 1) & 255
+            si = S[i]
+            j = (j + si) & 255
+            sj = S[j]
+            S[i] = sj
+            S[j] = si
+            out[k] = S[(si + sj) & 255]
+        self.i, self.j = i, j
+        return bytes(out)
+
+    def xor_into(self, buf):
+        """
+        Encrypt or decrypt a writable buffer in place.
+
+        Args:
+            buf (bytearray | memoryview | mmap): Data, overwritten with the result
+        """
+        mv = memoryview(buf).cast('B')
+        n = len(mv)
+        if n:
+            ks = self.keystream(n)
+            mv[:] = (int.from_bytes(mv, 'big') ^ int.from_bytes(ks, 'big')).to_bytes(n, 'big')
+
+    def update(self, data):
+        """
+        XOR data with the next len(data) keystream bytes.
+
+        Args:
+            data (bytes-like): Plaintext or ciphertext
+
+        Returns:
+            bytes: Ciphertext or plaintext
+        """
+        out = bytearray(data)
+        self.xor_into(out)
+        return bytes(out)
+
+    def iter_keystream(self):
+        """
+        Yield keystream bytes (ints) one at a time, indefinitely.
+
+        The generator advances this object's state, so keystream() and
+        xor_into() continue where it stopped and vice versa.
+        """
+        S = self.S
+        while True:
+            i = (self.i + 1) & 255
+            si = S[i]
+            j = (self.j + si) & 255
+            sj = S[j]
+            S[i] = sj
+            S[j] = si
+            self.i, self.j = i, j
+            yield S[(si + sj) & 255]
@@ -0,0 +1,237 @@
+"""
+Monoalphabetic Substitution Solver (Simulated Annealing on Quadgrams)
+
+frequency_analysis_compare in Substitution-ciphers.py pairs letters by
+frequency rank, which gets a few letters right and leaves the rest to
+guessing words. Here a key is searched instead:
+
+    score(key) = sum of log10 P(quadgram) over the decrypted text
+
+with P from the n-gram model of ngram_model.py (a memory-mapped table
+indexed by the base-26 code of the quadgram). Each step swaps two
+letters of the decryption key and is accepted if the score improves, or
+with probability 10^(delta / T) while the temperature T cools to 0
+(simulated annealing; T = 0 is plain hill climbing).
+
+A swap only changes the windows that contain one of the two cipher letters,
+so only those quadgrams are rescored: the window list of every letter pair
+is computed once, and the decrypted text and its window codes are patched
+in place instead of decrypting everything again.
+
+Restarts from different random keys run in a process pool; the search stops
+as soon as enough restarts end on the same best score.
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from formatting_utils import print_section_header
+from ngram_model import english_model, letters_to_codes, window_codes
+from substitution import ALPHABET, ENGLISH_PROBABILITIES, inverse_key, letter_histogram, monoalphabetic_decrypt
+
+# Order of the n-grams used for scoring
+NGRAM = 4
+
+# Annealing: proposals per restart, start temperature per window, and the
+# number of proposals without improvement after which a restart ends
+DEFAULT_STEPS = 20000
+DEFAULT_TEMPERATURE = 0.1
+DEFAULT_PATIENCE = 8000
+
+# Restarts that must agree on the best score before the search stops early
+DEFAULT_AGREE = 3
+
+# Letter offsets inside a window and their base-26 weights
+_OFFSETS = np.arange(NGRAM)
+_POWERS = 26 ** np.arange(NGRAM - 1, -1, -1, dtype=np.int64)
+
+
+class _Annealer:
+    """Decrypted text and window codes of one ciphertext, patched swap by swap."""
+
+    def __init__(self, cipher, table):
+        self.cipher = cipher
+        self.table = table
+        self.positions = [np.flatnonzero(cipher == x) for x in range(26)]
+        n_windows = len(cipher) - NGRAM + 1
+        self.windows = []
+        for pos in self.positions:
+            w = (pos[:, None] - np.arange(NGRAM)).ravel()
+            self.windows.append(np.unique(w[(w >= 0) & (w < n_windows)]))
+        self._pairs = {}
+
+    def pair_windows(self, x, y):
+        key = (x, y) if x < y else (y, x)
+        found = self._pairs.get(key)
+        if found is None:
+            found = self._pairs[key] = np.union1d(self.windows[x], self.windows[y])
+        return found
+
+    def run(self, decrypt, steps, temperature, patience, rng):
+        """Anneal from a decryption key (cipher letter -> plain letter); returns (score, key)."""
+        table = self.table
+        decrypt = decrypt.copy()
+        plain = decrypt[self.cipher]
+        codes = window_codes(plain, NGRAM)
+        score = float(table[codes].sum())
+        best_score, best_key = score, decrypt.copy()
+
+        pairs = rng.integers(0, 26, size=(steps, 2))
+        draws = rng.random(steps)
+        since_best = 0
+        for step in range(steps):
+            x, y = pairs[step]
+            if x == y:
+                continue
+            aff = self.pair_windows(x, y)
+            if not len(aff):
+                continue
+            px, py = decrypt[x], decrypt[y]
+            plain[self.positions[x]] = py
+            plain[self.positions[y]] = px
+            new_codes = plain[aff[:, None] + _OFFSETS].astype(np.int64) @ _POWERS
+            delta = float(table[new_codes].sum() - table[codes[aff]].sum())
+
+            t = temperature * (1 - step / steps)
+            if delta >= 0 or (t > 0 and draws[step] < 10 ** (delta / t)):
+                decrypt[x], decrypt[y] = py, px
+                codes[aff] = new_codes
+                score += delta
+                if score > best_score + 1e-6:
+                    best_score, best_key = score, decrypt.copy()
+                    since_best = 0
+                    continue
+            else:
+                plain[self.positions[x]] = px
+                plain[self.positions[y]] = py
+            since_best += 1
+            if since_best >= patience:
+                break
+        # Rescore exactly: the running sum drifts with float32 rounding, and
+        # runs are compared by score
+        exact = float(table[window_codes(best_key[self.cipher], NGRAM)].sum(dtype=np.float64))
+        return exact, best_key
+
+
+# Per-process state, set once by _init_worker instead of pickled per task
+_WORKER = {}
+
+
+def _init_worker(cipher, table):
+    _WORKER['annealer'] = _Annealer(cipher, table)
+
+
+def _restart(seed, start, steps, temperature, patience):
+    """Worker: one annealing run from `start` (or a random key)."""
+    rng = np.random.default_rng(seed)
+    if start is None:
+        start = rng.permutation(26).astype(np.uint8)
+    score, key = _WORKER['annealer'].run(start, steps, temperature, patience, rng)
+    return score, key.tobytes()
+
+
+def frequency_start(cipher):
+    """Decryption key that maps cipher letters to English letters by frequency rank."""
+    order = np.argsort(-np.bincount(cipher, minlength=26), kind='stable')
+    english = np.argsort(-ENGLISH_PROBABILITIES, kind='stable')
+    decrypt = np.empty(26, dtype=np.uint8)
+    decrypt[order] = english
+    return decrypt
+
+
+def solve_monoalphabetic(ciphertext, table=None, restarts=16, workers=None, steps=DEFAULT_STEPS,
+                         temperature=DEFAULT_TEMPERATURE, patience=DEFAULT_PATIENCE,
+                         agree=DEFAULT_AGREE, seed=None):
+    """
+    Recover the key of a monoalphabetic substitution cipher.
+
+    Args:
+        ciphertext (str | bytes): Ciphertext (non-letters are ignored for scoring)
+        table (np.ndarray, optional): Quadgram table (default: english_model().tables[4])
+        restarts (int): Maximum number of annealing runs (default: 16)
+        workers (int, optional): Worker processes (default: os.cpu_count(), 1 = in process)
+        steps (int): Swap proposals per run (default: 20000)
+        temperature (float): Start temperature per quadgram window (default: 0.1)
+        patience (int): Proposals without improvement that end a run (default: 8000)
+        agree (int): Runs that must reach the best score to stop early (default: 3)
+        seed (int, optional): Seed for reproducible results
+
+    Returns:
+        tuple: (key as 26 letters for monoalphabetic_decrypt, plaintext, score,
+                number of runs performed)
+    """
+    cipher = letters_to_codes(ciphertext)
+    if len(cipher) < NGRAM:
+        raise ValueError("Ciphertext too short to score")
+    if table is None:
+        table = english_model().tables[NGRAM]
+    temperature *= len(cipher)
+    seeds = np.random.SeedSequence(seed).spawn(restarts)
+    tasks = [(s, frequency_start(cipher) if k == 0 else None, steps, temperature, patience)
+             for k, s in enumerate(seeds)]
+
+    results = []
+
+    # Letters missing from the ciphertext can map anywhere without changing
+    # the score, so runs agree when they reach the same best score
+    def converged():
+        best = max(results)[0]
+        return sum(1 for r in results if abs(r[0] - best) < 1e-3) >= agree
+
+    workers = min(workers or os.cpu_count() or 1, restarts)
+    if workers == 1:
+        _init_worker(cipher, table)
+        for task in tasks:
+            results.append(_restart(*task))
+            if converged():
+                break
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(cipher, table)) as pool:
+            pending = {pool.submit(_restart, *task) for task in tasks}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                results.extend(f.result() for f in done)
+                if converged():
+                    for f in pending:
+                        f.cancel()
+                    break
+
+    score, decrypt = max(results)
+    # decrypt[cipher letter] = plain letter; the key maps plain -> cipher
+    decrypt_key = ''.join(ALPHABET[p] for p in decrypt)
+    key = inverse_key(decrypt_key)
+    return key, monoalphabetic_decrypt(ciphertext, key), score, len(results)
+
+
+if __name__ == "__main__":
+    import time
+    from substitution import monoalphabetic_encrypt
+
+    print_section_header("SUBSTITUTION SOLVER")
+    start = time.perf_counter()
+    table = english_model().tables[NGRAM]
+    print(f"Quadgram table loaded in {time.perf_counter() - start:.2f} s")
+
+    plaintext = (
+        "A stream cipher encrypts a digital data stream one bit or one byte at a time. The keystream "
+        "is produced by a pseudorandom generator from a short secret key, and the same keystream must "
+        "never be used twice, because the exclusive or of two ciphertexts is then the exclusive or of "
+        "the two plaintexts. A block cipher instead treats a block of plaintext as a whole and produces "
+        "a ciphertext block of equal length. Most symmetric encryption applications in use today are "
+        "based on block ciphers, and the modes of operation turn them into stream ciphers when needed."
+    )
+    key = "DKVQFIBJWPESCXHTMYAUOLRGZN"
+    ciphertext = monoalphabetic_encrypt(plaintext, key)
+    print(f"Ciphertext: {ciphertext[:70]}...")
+    print(f"Letter histogram: {letter_histogram(ciphertext).tolist()}")
+
+    start = time.perf_counter()
+    found, decrypted, score, runs = solve_monoalphabetic(ciphertext, table, seed=1)
+    print(f"Solved in {time.perf_counter() - start:.2f} s after {runs} runs (score {score:.1f})")
+    # Letters that do not occur in the message cannot be recovered
+    print(f"Key:       {found}  (actual {key})")
+    print(f"Plaintext: {decrypted[:70]}...")
+    print(f"Plaintext recovered exactly: {decrypted == plaintext}")
@@ -0,0 +1,157 @@
+"""
+Vectorized Vigenère and Autokey Ciphers
+
+Substitution-ciphers.py encrypts one character at a time, looks the
+decryption up with vigenere_table[row].index (a scan of the row) and prints
+every step. Here the whole text is one NumPy operation:
+
+    - the text becomes an array of code points once (utf-32 for str, so any
+      character survives; uint8 for bytes)
+    - a mask selects the ASCII letters and another their case bit (0x20)
+    - the letters are shifted by the key tiled to their number, modulo 26:
+      c = p + k (encrypt), p = c - k (decrypt); no table is needed
+    - the case bit is put back and everything that is not a letter is
+      copied unchanged
+
+As in vigenere_cipher_encrypt, the key advances only on letters.
+
+Autokey (the commented example in Substitution-ciphers.py): the key is
+the keyword followed by the plaintext itself. Encryption is again a single
+addition. Decryption looks sequential, p_i = c_i - p_(i-m), but along each
+of the m columns it unrolls to an alternating sum:
+
+    p_t = (-1)^t * (sum_(s <= t) (-1)^s c_s - k)      (mod 26)
+
+so it is one cumsum over a (rows, m) array.
+"""
+
+import numpy as np
+
+from formatting_utils import print_section_header
+
+
+def key_shifts(key):
+    """
+    Shifts 0..25 of the letters of a key (other characters are ignored).
+
+    Returns:
+        np.ndarray: (m,) int64
+    """
+    shifts = np.array([ord(c) - 65 for c in key.upper() if 'A' <= c <= 'Z'], dtype=np.int64)
+    if not len(shifts):
+        raise ValueError("Key must contain at least one letter A-Z")
+    return shifts
+
+
+def _split(text):
+    """(code points, letter mask, case bits, letters as 0..25) of a str or bytes."""
+    if isinstance(text, str):
+        points = np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+    else:
+        points = np.frombuffer(bytes(text), dtype=np.uint8)
+    folded = points | 0x20
+    letters = (folded >= 97) & (folded <= 122)
+    case = points[letters] & 0x20
+    return points, letters, case, (folded[letters] - 97).astype(np.int64)
+
+
+def _join(text, points, letters, case, codes):
+    """Put shifted letter codes (any int, reduced mod 26) back into the text."""
+    out = points.copy()
+    out[letters] = (codes % 26 + 65).astype(out.dtype) | case
+    if isinstance(text, str):
+        return out.tobytes().decode('utf-32-le')
+    return out.tobytes()
+
+
+def _tiled(shifts, n):
+    return np.resize(shifts, n)
+
+
+def vigenere_encrypt(text, key):
+    """
+    Encrypt with the Vigenère cipher.
+
+    Args:
+        text (str | bytes): Plaintext; case and non-letters are preserved
+        key (str): Keyword (its letters are used)
+
+    Returns:
+        str | bytes: Ciphertext of the same type
+
+    Example:
+        >>> vigenere_encrypt("wearediscoveredsaveyourself", "DECEPTIVE")
+        'zicvtwqngrzgvtwavzhcqyglmgj'
+    """
+    points, letters, case, codes = _split(text)
+    return _join(text, points, letters, case, codes + _tiled(key_shifts(key), len(codes)))
+
+
+def vigenere_decrypt(text, key):
+    """Decrypt the Vigenère cipher (see vigenere_encrypt)."""
+    points, letters, case, codes = _split(text)
+    return _join(text, points, letters, case, codes - _tiled(key_shifts(key), len(codes)))
+
+
+def autokey_encrypt(text, keyword):
+    """
+    Encrypt with the autokey cipher: key = keyword + plaintext letters.
+
+    Args:
+        text (str | bytes): Plaintext; case and non-letters are preserved
+        keyword (str): Keyword that starts the key
+
+    Returns:
+        str | bytes: Ciphertext of the same type
+
+    Example:
+        >>> autokey_encrypt("wearediscoveredsaveyourself", "DECEPTIVE")
+        'zicvtwqngkzeiigasxstslvvwla'
+    """
+    points, letters, case, codes = _split(text)
+    shifts = key_shifts(keyword)
+    key = np.concatenate([shifts, codes])[:len(codes)]
+    return _join(text, points, letters, case, codes + key)
+
+
+def autokey_decrypt(text, keyword):
+    """Decrypt the autokey cipher with per-column alternating cumulative sums."""
+    points, letters, case, codes = _split(text)
+    shifts = key_shifts(keyword)
+    m, n = len(shifts), len(codes)
+    rows = -(-n // m)
+    columns = np.zeros(rows * m, dtype=np.int64)
+    columns[:n] = codes
+    columns = columns.reshape(rows, m)
+    sign = np.where(np.arange(rows) % 2, -1, 1)[:, None]
+    alternating = np.cumsum(sign * columns, axis=0) % 26
+    plain = (sign * (alternating - shifts)).ravel()[:n]
+    return _join(text, points, letters, case, plain)
+
+
+if __name__ == "__main__":
+    import time
+
+    print_section_header("VIGENERE CIPHER")
+    plaintext = "We are discovered, save yourself!"
+    key = "DECEPTIVE"
+    encrypted = vigenere_encrypt(plaintext, key)
+    print(f"Plaintext: {plaintext}\nKey:       {key}\nEncrypted: {encrypted}")
+    print(f"Decrypted: {vigenere_decrypt(encrypted, key)}")
+
+    print_section_header("AUTOKEY CIPHER")
+    plaintext = "itisacommunicationservicethatenhancesthesecurityofasystem"
+    keyword = "confidentiality"
+    encrypted = autokey_encrypt(plaintext, keyword)
+    print(f"Plaintext: {plaintext}\nKeyword:   {keyword}\nEncrypted: {encrypted}")
+    print(f"Decrypted: {autokey_decrypt(encrypted, keyword)}")
+
+    print_section_header("BULK THROUGHPUT")
+    text = ("Attack at dawn! The quick brown fox jumps over the lazy dog. " * 80000)
+    for name, enc, dec in (("Vigenere", vigenere_encrypt, vigenere_decrypt),
+                           ("Autokey", autokey_encrypt, autokey_decrypt)):
+        start = time.perf_counter()
+        round_trip = dec(enc(text, "LEMON"), "LEMON")
+        elapsed = time.perf_counter() - start
+        print(f"{name:8}: {len(text) / 2**20:.1f} MiB encrypted and decrypted in {elapsed:.2f} s, "
+              f"round trip ok: {round_trip == text}")